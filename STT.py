@@ -4,11 +4,16 @@ import torch
 import gc
 import os
 import argparse
-import librosa
 import time
+import json
+import socket
+import numpy as np
+import sys
+import threading
 
 import warnings
-from contextlib import contextmanager, redirect_stdout, redirect_stderr
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 
 try:
     from deep_translator import GoogleTranslator
@@ -16,26 +21,132 @@ try:
 except Exception:
     _gt_available = False
 
+try:
+    from faster_whisper import WhisperModel
+    _fw_available = True
+except Exception:
+    _fw_available = False
+
+try:
+    from safetensors.torch import load_file as st_load_file, save_file as st_save_file
+    _st_available = True
+except Exception:
+    _st_available = False
+
+try:
+    from transformers import pipeline as hf_pipeline
+    _mt_available = True
+except Exception:
+    _mt_available = False
+
+# 지원 오디오 확장자 (앞쪽이 우선)
+_AUDIO_EXTS = ('mp3', 'wav', 'flac', 'm4a', 'ogg', 'mp4', 'aac')
+
+# 상주 워커(--serve) 소켓 경로
+SOCKET_PATH = "/tmp/skkai-stt.sock"
+# 워커 응답 대기 한도 (초), 넘으면 로컬 처리로 폴백
+WORKER_TIMEOUT = float(os.environ.get("STT_WORKER_TIMEOUT", "300"))
+
+# 변환된 가중치 캐시 (safetensors + dims JSON)
+MODEL_CACHE_DIR = os.path.join("weights", "cache")
+
+# 오프라인 번역 모델 (MarianMT), 없는 언어쌍은 GoogleTranslator 사용
+LOCAL_MT_MODELS = {
+    ('ko', 'en'): "Helsinki-NLP/opus-mt-ko-en",
+    ('en', 'ko'): "Helsinki-NLP/opus-mt-tc-big-en-ko",
+}
+_mt_pipelines = {}
+
+# Silero VAD (--vad 사용 시 최초 1회 로드)
+_vad = None
+
+# silent_io 중첩 상태 (오디오/모델 로드 스레드가 동시에 진입할 수 있음)
+_silent_lock = threading.Lock()
+_silent_depth = 0
+_silent_state = None
+
 
 @contextmanager
 def silent_io():
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        with open(os.devnull, "w") as devnull, \
-             redirect_stdout(devnull), \
-             redirect_stderr(devnull):
-            yield
+    """stdout/stderr/경고 억제
+
+    sys.stdout 교체는 프로세스 전역이므로 여러 스레드가 동시에 진입해도
+    첫 진입에서만 바꾸고 마지막 퇴장에서만 되돌린다.
+    """
+    global _silent_depth, _silent_state
+    with _silent_lock:
+        if _silent_depth == 0:
+            devnull = open(os.devnull, "w")
+            catcher = warnings.catch_warnings()
+            catcher.__enter__()
+            warnings.simplefilter("ignore")
+            _silent_state = (sys.stdout, sys.stderr, devnull, catcher)
+            sys.stdout = sys.stderr = devnull
+        _silent_depth += 1
+    try:
+        yield
+    finally:
+        with _silent_lock:
+            _silent_depth -= 1
+            if _silent_depth == 0:
+                stdout, stderr, devnull, catcher = _silent_state
+                sys.stdout, sys.stderr = stdout, stderr
+                catcher.__exit__(None, None, None)
+                devnull.close()
+                _silent_state = None
 
 def find_audio_file(audio_dir, audio_name):
-    extensions = ['mp3', 'wav', 'flac', 'm4a', 'ogg', 'mp4', 'aac']
-    for ext in extensions:
-        exact_path = os.path.join(audio_dir, f"{audio_name}.{ext}")
-        if os.path.exists(exact_path):
-            return exact_path
+    """디렉토리를 한 번만 훑어 파일명(확장자 제외)으로 검색, 없으면 부분 일치"""
+    try:
+        entries = [e for e in os.scandir(audio_dir) if e.is_file()]
+    except OSError:
+        return None
+
+    # 같은 이름이 여러 확장자로 있으면 _AUDIO_EXTS 순서가 앞선 것 우선
+    candidates = []
+    for e in entries:
+        stem, _, ext = e.name.rpartition('.')
+        ext = ext.lower()
+        if stem and ext in _AUDIO_EXTS:
+            candidates.append((_AUDIO_EXTS.index(ext), stem, e.path))
+    by_stem = {}
+    for _, stem, path in sorted(candidates):
+        by_stem.setdefault(stem, path)
+
+    if audio_name in by_stem:
+        return by_stem[audio_name]
+    for stem in sorted(by_stem):
+        if audio_name in stem:
+            return by_stem[stem]
     return None
 
+def get_local_translator(source_lang, target_lang):
+    """언어쌍별 MarianMT 파이프라인을 1회 로드 (INT8 동적 양자화), 실패 시 None"""
+    key = (source_lang, target_lang)
+    if key not in _mt_pipelines:
+        translator = None
+        if _mt_available and key in LOCAL_MT_MODELS:
+            try:
+                with silent_io():
+                    translator = hf_pipeline("translation", model=LOCAL_MT_MODELS[key], device=-1)
+                    translator.model = torch.quantization.quantize_dynamic(
+                        translator.model, {torch.nn.Linear}, dtype=torch.qint8)
+            except Exception:
+                translator = None
+        _mt_pipelines[key] = translator
+    return _mt_pipelines[key]
+
 def translate_with_gt(text, source_lang, target_lang):
-    """GoogleTranslator를 사용한 번역"""
+    """로컬 MarianMT 우선, 불가하면 GoogleTranslator로 번역"""
+    if not text:
+        return text
+    translator = get_local_translator(source_lang, target_lang)
+    if translator is not None:
+        try:
+            return translator(text)[0]["translation_text"]
+        except Exception:
+            pass
+
     if not _gt_available:
         return f"(번역 필요: pip install deep-translator)"
     try:
@@ -43,15 +154,352 @@ def translate_with_gt(text, source_lang, target_lang):
     except Exception as e:
         return f"(번역 실패: {str(e)[:50]})"
 
+def get_vad():
+    """Silero VAD 모델과 get_speech_timestamps 를 1회 로드"""
+    global _vad
+    if _vad is None:
+        with silent_io():
+            vad_model, utils = torch.hub.load('snakers4/silero-vad', 'silero_vad', trust_repo=True)
+        _vad = (vad_model, utils[0])
+    return _vad
+
+def trim_silence(audio_data, sr=16000):
+    """음성 구간만 이어붙여 인코더 입력 길이를 줄임 (음성이 없으면 원본 유지)"""
+    vad_model, get_speech_timestamps = get_vad()
+    speech_ts = get_speech_timestamps(torch.from_numpy(audio_data), vad_model, sampling_rate=sr)
+    if not speech_ts:
+        return audio_data
+    return np.concatenate([audio_data[ts['start']:ts['end']] for ts in speech_ts])
+
+def transcribe_audio(model, audio_data, backend, task="transcribe"):
+    """백엔드별 음성 인식 호출 → (텍스트, 언어)"""
+    if backend == "faster":
+        # CTranslate2 INT8 백엔드: segments는 제너레이터이므로 여기서 소비
+        segments, info = model.transcribe(audio_data, task=task, beam_size=1, vad_filter=False)
+        text = " ".join(s.text.strip() for s in segments)
+        return text.strip(), info.language
+
+    if backend == "ort":
+        result = model.transcribe(audio_data, task=task)
+        return result["text"], result["language"]
+
+    # CUDA에서는 FP16(텐서 코어), CPU는 FP32
+    fp16 = model.device.type == "cuda"
+    # verbose=None 이면 진행 표시/출력이 없으므로 silent_io 불필요
+    result = model.transcribe(audio_data, task=task, fp16=fp16, verbose=None)
+    return (result.get("text") or "").strip(), result.get("language", "unknown")
+
+def transcribe_shared_encoder(model, audio_data, outputs="both"):
+    """30초 이하 오디오: 인코더 1회 실행 후 전사/번역 디코드가 같은 특징을 공유"""
+    fp16 = model.device.type == "cuda"
+    # inference_mode가 아닌 no_grad: 여기서 만든 정적 KV 버퍼를 이후 no_grad 요청(model.transcribe)이 재사용
+    with torch.no_grad():
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio_data), model.dims.n_mels)
+        mel = mel.to(model.device).unsqueeze(0)
+        audio_features = model.embed_audio(mel.half() if fp16 else mel)
+
+        _, probs = model.detect_language(audio_features)
+        lang = max(probs[0], key=probs[0].get)
+
+        options = whisper.DecodingOptions(task="transcribe", language=lang, fp16=fp16)
+        text = whisper.decode(model, audio_features, options)[0].text.strip()
+
+        eng_text = None
+        if lang != "en" and needs_english(lang, outputs):
+            options = whisper.DecodingOptions(task="translate", language=lang, fp16=fp16)
+            eng_text = whisper.decode(model, audio_features, options)[0].text.strip()
+
+    return text, lang, eng_text
+
+def load_model_cached(name, device):
+    """safetensors(mmap) 캐시로 Whisper 로드, 캐시가 없으면 .pt에서 1회 변환
+
+    CUDA용 캐시는 저장 시점에 FP16으로 변환해 둔다. LayerNorm은 입력을 FP32로 올려
+    계산하므로(whisper.model.LayerNorm) 가중치도 FP32로 둔다.
+    """
+    if not _st_available:
+        return whisper.load_model(name, device=device)
+
+    key = os.path.splitext(os.path.basename(name))[0]
+    precision = "fp16" if device == "cuda" else "fp32"
+    cache_path = os.path.join(MODEL_CACHE_DIR, f"{key}.{precision}.safetensors")
+    dims_path = os.path.join(MODEL_CACHE_DIR, f"{key}.dims.json")
+
+    if not (os.path.isfile(cache_path) and os.path.isfile(dims_path)):
+        model = whisper.load_model(name, device="cpu")
+        state = model.state_dict()
+        if device == "cuda":
+            fp32_prefixes = tuple(f"{n}." for n, m in model.named_modules()
+                                  if isinstance(m, torch.nn.LayerNorm))
+            state = {k: v if k.startswith(fp32_prefixes) else v.half() for k, v in state.items()}
+        os.makedirs(MODEL_CACHE_DIR, exist_ok=True)
+        st_save_file({k: v.contiguous() for k, v in state.items()}, cache_path)
+        with open(dims_path, "w", encoding="utf-8") as f:
+            json.dump(model.dims.__dict__, f)
+        del model, state
+
+    with open(dims_path, "r", encoding="utf-8") as f:
+        dims = whisper.ModelDimensions(**json.load(f))
+    state = st_load_file(cache_path, device=device)
+    model = whisper.Whisper(dims)
+    try:
+        model.load_state_dict(state, assign=True)
+    except TypeError:
+        # torch < 2.1: assign 인자 없음
+        model.load_state_dict(state)
+
+    # 이전 버전이 LayerNorm까지 FP16으로 저장한 캐시도 동작하도록
+    for module in model.modules():
+        if isinstance(module, torch.nn.LayerNorm):
+            module.float()
+
+    alignment_heads = whisper._ALIGNMENT_HEADS.get(name)
+    if alignment_heads is not None:
+        model.set_alignment_heads(alignment_heads)
+    return model.to(device)
+
+def compile_encoder(model, device):
+    """인코더를 torch.compile(CUDA graph)로 감싸고 더미 30초 mel로 미리 컴파일
+
+    디코더는 eager로 둔다: 정적 KV 캐시(use_static_kv_cache)로 토큰마다 torch.cat 재할당은
+    없어졌지만, 어텐션이 보는 캐시 구간(buffer[:, :end])의 길이가 매 토큰 달라져
+    고정 shape 그래프 캡처는 여전히 되지 않는다.
+    """
+    model.encoder = torch.compile(model.encoder, mode="reduce-overhead", fullgraph=False)
+    dtype = next(model.parameters()).dtype
+    dummy = torch.zeros(1, model.dims.n_mels, whisper.audio.N_FRAMES, device=device, dtype=dtype)
+    # transcribe()는 no_grad로 돌므로 워밍업도 같은 모드로 (inference 텐서가 섞이지 않도록)
+    with torch.no_grad():
+        # CUDA graph는 몇 번의 호출 뒤에 기록되므로 두 번 실행
+        for _ in range(2):
+            model.encoder(dummy)
+    return model
+
+def load_stt_model(model_name, backend, device, compile_model=False, int8=False):
+    """백엔드에 맞는 모델 로드
+
+    compile_model=True 이면 CUDA에서 인코더 컴파일, int8=True 이면 CPU에서 INT8 양자화
+    """
+    if backend == "faster":
+        if not _fw_available:
+            raise RuntimeError("faster-whisper 필요: pip install faster-whisper")
+        # CT2가 정밀도를 직접 관리하므로 model.float() 불필요
+        compute_type = "int8" if device == "cpu" else "int8_float16"
+        with silent_io():
+            return WhisperModel(model_name, device=device, compute_type=compute_type)
+
+    if backend == "ort":
+        from backends.ort_whisper import ORTWhisper
+        with silent_io():
+            return ORTWhisper(model_name, device=device, quantize=int8)
+
+    with silent_io():
+        model = load_model_cached(model_name, device)
+
+    # 디코더 KV 캐시를 미리 할당해 30초 구간/요청마다 재사용
+    model.use_static_kv_cache = True
+
+    if device == "cpu" and int8:
+        model = whisper.model.quantize_int8(model)
+
+    if device == "cuda":
+        # FP16으로 돌지 않는 잔여 FP32 matmul은 TF32 텐서 코어 사용
+        torch.set_float32_matmul_precision('high')
+        if compile_model and hasattr(torch, "compile"):
+            with silent_io():
+                model = compile_encoder(model, device)
+    return model
+
+def needs_english(lang, outputs):
+    """영어 결과가 필요한지 (기타 언어는 한국어 번역의 경유지로도 필요)"""
+    return outputs != "ko" or lang not in ("ko", "en")
+
+def load_input_audio(audio_file, vad=False):
+    """오디오 로드 (ffmpeg → 16kHz mono float32 직접 파이프), 필요 시 무음 제거"""
+    audio_data = whisper.load_audio(audio_file)
+    if vad:
+        audio_data = trim_silence(audio_data)
+    return audio_data
+
+def run_stt(model, audio_data, backend, use_whisper_translate=False, outputs="both"):
+    """음성 인식 → 번역, (언어, 한국어, 영어) 반환
+
+    outputs 가 'ko'/'en' 이면 필요 없는 쪽 번역은 건너뛰고 None 으로 둔다.
+    """
+    # 음성 인식 (Whisper 1회 호출 - 언어 감지 + 전사)
+    whisper_en = None
+    if use_whisper_translate and backend == "whisper" and len(audio_data) <= whisper.audio.N_SAMPLES:
+        # 한 구간(30초) 안이면 인코더 출력을 번역 디코드에도 재사용
+        text, lang, whisper_en = transcribe_shared_encoder(model, audio_data, outputs)
+    else:
+        text, lang = transcribe_audio(model, audio_data, backend)
+
+    kor_text = text if lang == "ko" else None
+    eng_text = text if lang == "en" else None
+    want_ko = outputs != "en"
+
+    # 원하는 결과가 이미 나왔으면 번역 생략
+    if lang == "ko" and not needs_english(lang, outputs):
+        return lang, kor_text, eng_text
+    if lang == "en" and not want_ko:
+        return lang, kor_text, eng_text
+
+    # 번역 전략 선택
+    if use_whisper_translate:
+        # ===== 옵션 A: Whisper 번역 사용 (느림, 정확) =====
+        if lang == "en":
+            # Whisper는 영어→한국어 직접 번역 불가, GoogleTranslator 사용
+            kor_text = translate_with_gt(eng_text, 'en', 'ko')
+        else:
+            eng_text = whisper_en
+            if eng_text is None:
+                eng_text, _ = transcribe_audio(model, audio_data, backend, task="translate")
+            if lang != "ko" and want_ko:
+                kor_text = translate_with_gt(eng_text, 'en', 'ko')
+    else:
+        # ===== 옵션 B: GoogleTranslator 사용 (빠름, 기본값) =====
+        if lang == "ko":
+            eng_text = translate_with_gt(kor_text, 'ko', 'en')
+        elif lang == "en":
+            kor_text = translate_with_gt(eng_text, 'en', 'ko')
+        else:
+            # 기타 언어 → 영어 → 한국어
+            eng_text = translate_with_gt(text, lang, 'en')
+            if want_ko:
+                kor_text = translate_with_gt(eng_text, 'en', 'ko')
+
+    return lang, kor_text, eng_text
+
+def _recv_json(conn):
+    """소켓에서 개행 단위 JSON 한 건 수신"""
+    buf = b""
+    while not buf.endswith(b"\n"):
+        chunk = conn.recv(65536)
+        if not chunk:
+            break
+        buf += chunk
+    return json.loads(buf.decode("utf-8")) if buf else None
+
+def _send_json(conn, obj):
+    conn.sendall(json.dumps(obj, ensure_ascii=False).encode("utf-8") + b"\n")
+
+def model_config(args):
+    """워커와 요청이 같은 모델 설정인지 비교하기 위한 값"""
+    return {"model": args.model, "backend": args.backend, "int8": args.int8, "compile": args.compile}
+
+def config_mismatch(worker_config, requested):
+    """요청 설정을 워커가 처리할 수 없으면 다른 항목 목록 (compile은 결과가 같으므로 컴파일된 워커면 무관)"""
+    diff = [k for k in ("model", "backend", "int8") if worker_config.get(k) != requested.get(k)]
+    if requested.get("compile") and not worker_config.get("compile"):
+        diff.append("compile")
+    return diff
+
+def request_worker(audio_file, config, use_whisper_translate=False, outputs="both", vad=False):
+    """실행 중인 워커가 있으면 요청 전달, 없거나 모델 설정이 다르면 None"""
+    if not hasattr(socket, "AF_UNIX") or not os.path.exists(SOCKET_PATH):
+        return None
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            # 연결은 짧게, 인식 결과는 WORKER_TIMEOUT까지 대기 (워커가 멈춰도 CLI가 영원히 막히지 않음)
+            conn.settimeout(5)
+            conn.connect(SOCKET_PATH)
+            _send_json(conn, {
+                "audio_path": os.path.abspath(audio_file),
+                "use_whisper_translate": use_whisper_translate,
+                "outputs": outputs,
+                "vad": vad,
+                "config": config,
+            })
+            conn.settimeout(WORKER_TIMEOUT)
+            reply = _recv_json(conn)
+    except socket.timeout:
+        print("워커 응답 시간 초과, 직접 처리합니다")
+        return None
+    except OSError:
+        # 소켓 파일만 남아있는 경우 등 → 로컬 처리로 폴백
+        return None
+    if reply and "mismatch" in reply:
+        print(f"워커 모델 설정이 다릅니다 ({', '.join(reply['mismatch'])}: {reply['config']}), 직접 처리합니다")
+        return None
+    return reply
+
+def serve(args):
+    """모델을 1회 로드한 뒤 유닉스 소켓으로 요청을 계속 처리"""
+    if not hasattr(socket, "AF_UNIX"):
+        print("이 플랫폼은 유닉스 소켓을 지원하지 않습니다")
+        return
+
+    device = "cuda" if torch.cuda.is_available() else "cpu"
+    # 상주 워커는 컴파일 비용이 여러 요청에 분산되므로 항상 컴파일
+    model = load_stt_model(args.model, args.backend, device, compile_model=True, int8=args.int8)
+    config = dict(model_config(args), compile=True)
+
+    if os.path.exists(SOCKET_PATH):
+        os.remove(SOCKET_PATH)
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        server.bind(SOCKET_PATH)
+        server.listen()
+        print(f"STT 워커 대기 중: {SOCKET_PATH} (model={args.model}, device={device})")
+        while True:
+            conn, _ = server.accept()
+            with conn:
+                try:
+                    req = _recv_json(conn)
+                    if not req:
+                        continue
+                    # 다른 모델/백엔드로 실행한 요청은 거절 → 클라이언트가 직접 로드
+                    mismatch = config_mismatch(config, req.get("config", {}))
+                    if mismatch:
+                        _send_json(conn, {"mismatch": mismatch, "config": config})
+                        continue
+                    audio_data = load_input_audio(req["audio_path"], req.get("vad", False))
+                    lang, kor_text, eng_text = run_stt(
+                        model, audio_data, args.backend,
+                        req.get("use_whisper_translate", False),
+                        req.get("outputs", "both"))
+                    _send_json(conn, {"language": lang, "ko": kor_text, "en": eng_text})
+                except Exception as e:
+                    _send_json(conn, {"error": str(e)})
+    except KeyboardInterrupt:
+        print("\nSTT 워커 종료")
+    finally:
+        # 메모리 정리 (워커 수명 종료 시 1회)
+        server.close()
+        if os.path.exists(SOCKET_PATH):
+            os.remove(SOCKET_PATH)
+        del model
+        gc.collect()
+        if torch.cuda.is_available():
+            torch.cuda.empty_cache()
+
 def main():
     parser = argparse.ArgumentParser(description='Whisper STT Script')
     parser.add_argument('--model', type=str, default='base', help='Model to use')
-    parser.add_argument('--audio', type=str, required=True, help='Audio file name')
+    parser.add_argument('--audio', type=str, help='Audio file name')
     parser.add_argument('--audio_dir', type=str, default='audio_data', help='Audio directory')
     parser.add_argument('--use-whisper-translate', action='store_true', 
                         help='Whisper의 번역 기능 사용 (느림, 기본: GoogleTranslator)')
+    parser.add_argument('--backend', type=str, default='whisper', choices=['whisper', 'faster', 'ort'],
+                        help='추론 백엔드 (faster: faster-whisper CTranslate2 INT8, ort: ONNX Runtime)')
+    parser.add_argument('--serve', action='store_true',
+                        help=f'모델을 상주시키는 워커 실행 ({SOCKET_PATH})')
+    parser.add_argument('--outputs', type=str, default='both', choices=['both', 'ko', 'en'],
+                        help='출력할 결과 (필요 없는 쪽 번역은 생략)')
+    parser.add_argument('--vad', action='store_true',
+                        help='Silero VAD로 무음 구간 제거 후 인식 (긴 무음이 많은 오디오에 유리)')
+    parser.add_argument('--compile', action='store_true',
+                        help='CUDA에서 인코더를 torch.compile (최초 컴파일 비용 있음, --serve는 항상 적용)')
+    parser.add_argument('--int8', action='store_true',
+                        help='CPU에서 Linear 층 INT8 동적 양자화 (whisper 백엔드)')
     args = parser.parse_args()
 
+    if args.serve:
+        serve(args)
+        return
+    if not args.audio:
+        parser.error("--audio 가 필요합니다")
+
     model = None
     try:
         # 1. 오디오 파일 찾기
@@ -60,59 +508,34 @@ def main():
             print(f"파일없음: '{args.audio}' (dir='{args.audio_dir}')")
             return
 
-        # 2. 오디오 로드
-        with silent_io():
-            audio_data = librosa.load(audio_file, sr=16000, mono=True)[0]        
-
-        # 3. 모델 로드 (1회만)
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        with silent_io():
-            model = whisper.load_model(args.model, device=device)        
-
-        if device == "cuda":
-            model.float()
-
-        # 4. 음성 인식 (Whisper 1회 호출 - 언어 감지 + 전사)
-        with silent_io():
-            result = model.transcribe(audio_data, fp16=False)
-        
-        lang = result.get("language", "unknown")
-        text = (result.get("text") or "").strip()
-
-        # 5. 번역 전략 선택
-        if args.use_whisper_translate:
-            # ===== 옵션 A: Whisper 번역 사용 (느림, 정확) =====
-            if lang == "ko":
-                kor_text = text
-                with silent_io():
-                    translated_en = model.transcribe(audio_data, task="translate", fp16=False)
-                eng_text = (translated_en.get("text") or "").strip()
-            elif lang == "en":
-                eng_text = text
-                # Whisper는 영어→한국어 직접 번역 불가, GoogleTranslator 사용
-                kor_text = translate_with_gt(eng_text, 'en', 'ko')
-            else:
-                with silent_io():
-                    to_en = model.transcribe(audio_data, task="translate", fp16=False)
-                eng_text = (to_en.get("text") or "").strip()
-                kor_text = translate_with_gt(eng_text, 'en', 'ko')
+        # 2. 워커가 떠 있으면 모델 로드 없이 위임
+        reply = request_worker(audio_file, model_config(args),
+                               args.use_whisper_translate, args.outputs, args.vad)
+        if reply is not None:
+            if "error" in reply:
+                print(f"에러: {reply['error']}")
+                return
+            lang, kor_text, eng_text = reply["language"], reply["ko"], reply["en"]
         else:
-            # ===== 옵션 B: GoogleTranslator 사용 (빠름, 기본값) =====
-            if lang == "ko":
-                kor_text = text
-                eng_text = translate_with_gt(kor_text, 'ko', 'en')
-            elif lang == "en":
-                eng_text = text
-                kor_text = translate_with_gt(eng_text, 'en', 'ko')
-            else:
-                # 기타 언어 → 영어 → 한국어
-                eng_text = translate_with_gt(text, lang, 'en')
-                kor_text = translate_with_gt(eng_text, 'en', 'ko')
+            # 3. 오디오 로드와 모델 로드를 동시에 (둘 다 I/O 대기 중 GIL 해제)
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            with ThreadPoolExecutor(max_workers=2) as ex:
+                fut_audio = ex.submit(load_input_audio, audio_file, args.vad)
+                fut_model = ex.submit(load_stt_model, args.model, args.backend, device,
+                                      compile_model=args.compile, int8=args.int8)
+                audio_data = fut_audio.result()
+                model = fut_model.result()
+
+            # 4. 음성 인식 + 번역
+            lang, kor_text, eng_text = run_stt(
+                model, audio_data, args.backend, args.use_whisper_translate, args.outputs)
 
-        # 6. 최종 출력
+        # 5. 최종 출력
         print(f"[언어 감지] {lang}")
-        print(f"[한국어] {kor_text}")
-        print(f"[영어] {eng_text}")
+        if args.outputs != "en":
+            print(f"[한국어] {kor_text}")
+        if args.outputs != "ko":
+            print(f"[영어] {eng_text}")
 
     except Exception as e:
         print(f"에러: {e}")
@@ -129,4 +552,4 @@ if __name__ == "__main__":
     start_time = time.time()
     main()
     end_time = time.time()
-    print(f"실행 시간: {end_time - start_time:.2f}초")
\ No newline at end of file
+    print(f"실행 시간: {end_time - start_time:.2f}초")
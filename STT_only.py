@@ -3,32 +3,130 @@ import whisper
 import torch
 import gc
 import os
+import sys
 import argparse
-import librosa
 import time
+import functools
+import hashlib
+import numpy as np
+import soundfile as sf
+import soxr
 
+import logging
 import warnings
-from contextlib import contextmanager, redirect_stdout, redirect_stderr
 
+try:
+    from faster_whisper import WhisperModel
+    _fw_available = True
+except Exception:
+    _fw_available = False
+
+try:
+    from pywhispercpp.model import Model as CppModel
+    import _pywhispercpp as _pw
+    _cpp_available = True
+except Exception:
+    _cpp_available = False
+
+# whisper.cpp GGML 양자화 모델 저장 위치
+CPP_MODELS_DIR = os.path.join(os.path.expanduser("~"), ".cache", "whisper.cpp")
+
+# log-mel 캐시 위치 (같은 클립 반복 전사 시 FFT 생략)
+MEL_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "skkai", "mel")
+# --mel-cache 사용 시 캐시 최대 크기 (넘으면 오래 안 쓴 파일부터 삭제), 30초 클립 1개 ≈ 1.9MB
+MEL_CACHE_MAX_BYTES = int(os.environ.get("SKKAI_MEL_CACHE_MB", "512")) * 1024 * 1024
+
+# 지원 오디오 확장자 (앞쪽이 우선)
+_AUDIO_EXTS = ('mp3', 'wav', 'flac', 'm4a', 'ogg', 'mp4', 'aac')
 
-@contextmanager
-def silent_io():
-    with warnings.catch_warnings():
-        warnings.simplefilter("ignore")
-        with open(os.devnull, "w") as devnull, \
-             redirect_stdout(devnull), \
-             redirect_stderr(devnull):
-            yield
 
 def find_audio_file(audio_dir, audio_name):
-    extensions = ['mp3', 'wav', 'flac', 'm4a', 'ogg', 'mp4', 'aac']
-    for ext in extensions:
-        exact_path = os.path.join(audio_dir, f"{audio_name}.{ext}")
-        if os.path.exists(exact_path):
+    for ext in _AUDIO_EXTS:
+        exact_path = f"{audio_dir}{os.sep}{audio_name}.{ext}"
+        if os.path.isfile(exact_path):
             return exact_path
     return None
 
-def main():
+def load_audio_16k(audio_file):
+    """16kHz mono float32 로드: soundfile(+soxr)로 직접 읽고, 못 읽는 포맷만 librosa 사용"""
+    try:
+        data, sr = sf.read(audio_file, dtype="float32", always_2d=False)
+    except Exception:
+        # mp3/m4a 등 libsndfile 미지원 포맷 → librosa (필요할 때만 import)
+        import librosa
+        return librosa.load(audio_file, sr=16000, mono=True)[0]
+
+    if data.ndim == 2:
+        data = data.mean(axis=1)
+    if sr != 16000:
+        data = soxr.resample(data, sr, 16000)
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+def get_mel_cached(audio_data, n_mels):
+    """30초 무음 패딩을 포함한 log-mel을 오디오 해시 기준으로 디스크에 캐시"""
+    h = hashlib.sha1(audio_data.tobytes()).hexdigest()
+    mel_path = os.path.join(MEL_CACHE_DIR, f"{h}_{n_mels}.npy")
+    if os.path.isfile(mel_path):
+        os.utime(mel_path)  # LRU 순서 갱신
+        return torch.from_numpy(np.load(mel_path))
+
+    mel = whisper.log_mel_spectrogram(audio_data, n_mels, padding=whisper.audio.N_SAMPLES)
+    os.makedirs(MEL_CACHE_DIR, exist_ok=True)
+    np.save(mel_path, mel.cpu().numpy())
+    _evict_mel_cache()
+    return mel
+
+def _evict_mel_cache():
+    """캐시 합계가 MEL_CACHE_MAX_BYTES를 넘으면 마지막 사용 시각이 오래된 파일부터 삭제"""
+    entries = [(e.stat().st_mtime, e.stat().st_size, e.path)
+               for e in os.scandir(MEL_CACHE_DIR) if e.name.endswith(".npy")]
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= MEL_CACHE_MAX_BYTES:
+            break
+        os.remove(path)
+        total -= size
+
+_vad = None
+
+def trim_silence(audio_data, sr=16000):
+    """Silero VAD로 앞뒤 무음 제거: 첫 음성 시작 ~ 마지막 음성 끝 (음성이 없으면 원본 유지)"""
+    global _vad
+    if _vad is None:
+        vad_model, utils = torch.hub.load('snakers4/silero-vad', 'silero_vad', trust_repo=True, verbose=False)
+        _vad = (vad_model, utils[0])
+    vad_model, get_speech_timestamps = _vad
+    speech_ts = get_speech_timestamps(torch.from_numpy(audio_data), vad_model, sampling_rate=sr)
+    if not speech_ts:
+        return audio_data
+    return audio_data[speech_ts[0]['start']:speech_ts[-1]['end']]
+
+def _cpp_detected_language(model):
+    """whisper.cpp가 transcribe() 중 자동 감지한 언어 코드 (컨텍스트에서 읽어 인코더 재실행 없음)"""
+    try:
+        return _pw.whisper_lang_str(_pw.whisper_full_lang_id(model._ctx))
+    except Exception:
+        return "unknown"
+
+@functools.lru_cache(maxsize=2)
+def _get_model(backend, name, device):
+    """(백엔드, 모델, 디바이스)별로 1회만 로드해 프로세스 내에서 재사용"""
+    if backend == "cpp":
+        # ggml-{model}-q5_1.bin 은 최초 1회 CPP_MODELS_DIR 에 내려받아 재사용
+        os.makedirs(CPP_MODELS_DIR, exist_ok=True)
+        return CppModel(f"{name}-q5_1", models_dir=CPP_MODELS_DIR,
+                        n_threads=os.cpu_count(), language="auto")
+    if backend == "faster":
+        compute_type = "int8" if device == "cpu" else "float16"
+        return WhisperModel(name, device=device, compute_type=compute_type,
+                            cpu_threads=os.cpu_count())
+
+    model = whisper.load_model(name, device=device)
+    if device == "cuda":
+        model.float()
+    return model
+
+def main(argv=None):
     parser = argparse.ArgumentParser(description='Whisper STT Only (No Translation)')
     parser.add_argument('--model', type=str, default='base', 
                         help='Whisper model (tiny/base/small/medium/large)')
@@ -38,74 +136,126 @@ def main():
                         help='Audio directory path')
     parser.add_argument('--verbose', action='store_true', 
                         help='Show detailed transcription info')
-    args = parser.parse_args()
+    parser.add_argument('--backend', type=str, default='whisper', choices=['whisper', 'faster', 'cpp'],
+                        help='Inference backend (faster: faster-whisper CTranslate2 int8/fp16, '
+                             'cpp: whisper.cpp Q5_1 GGML)')
+    parser.add_argument('--vad', action='store_true',
+                        help='Trim leading/trailing silence with Silero VAD before transcription')
+    parser.add_argument('--mel-cache', action='store_true',
+                        help=f'Cache log-mel spectrograms on disk ({MEL_CACHE_DIR}, '
+                             'limit SKKAI_MEL_CACHE_MB, default 512)')
+    parser.add_argument('--oneshot', action='store_true',
+                        help='Release the cached model after this run')
+    args = parser.parse_args(argv)
 
-    model = None
-    try:
-        # 1. 오디오 파일 찾기
-        audio_file = find_audio_file(args.audio_dir, args.audio)
-        if not audio_file:
-            print(f"❌ 파일을 찾을 수 없습니다: '{args.audio}' (dir='{args.audio_dir}')")
-            return
-
-        print(f"📁 파일: {audio_file}")
-
-        # 2. 오디오 로드
-        print("🔊 오디오 로딩 중...")
-        with silent_io():
-            audio_data = librosa.load(audio_file, sr=16000, mono=True)[0]
-        
-        duration = len(audio_data) / 16000
-        print(f"⏱️  길이: {duration:.2f}초")
+    # 라이브러리 경고/진행률(stderr)은 실행당 한 번만 막고 끝나면 복구 (--verbose 시 표시)
+    # 같은 프로세스에서 main()을 다시 부르는 호출자에게 경고/로그 설정이 남지 않도록 모두 되돌림
+    prev_stderr = sys.stderr
+    root_logger = logging.getLogger()
+    prev_level = root_logger.level
+    with warnings.catch_warnings():
+        if not args.verbose:
+            sys.stderr = open(os.devnull, "w")
+            warnings.simplefilter("ignore")
+            root_logger.setLevel(logging.ERROR)
 
-        # 3. 모델 로드
-        device = "cuda" if torch.cuda.is_available() else "cpu"
-        print(f"🤖 모델 로딩 중... (model={args.model}, device={device})")
+        model = None
+        try:
+            # 1. 오디오 파일 찾기
+            audio_file = find_audio_file(args.audio_dir, args.audio)
+            if not audio_file:
+                print(f"❌ 파일을 찾을 수 없습니다: '{args.audio}' (dir='{args.audio_dir}')")
+                return
+
+            print(f"📁 파일: {audio_file}")
+
+            # 2. 오디오 로드
+            print("🔊 오디오 로딩 중...")
+            audio_data = load_audio_16k(audio_file)
         
-        with silent_io():
-            model = whisper.load_model(args.model, device=device)
+            duration = len(audio_data) / 16000
+            print(f"⏱️  길이: {duration:.2f}초")
+
+            if args.vad:
+                audio_data = trim_silence(audio_data)
+                print(f"✂️  무음 제거 후: {len(audio_data) / 16000:.2f}초")
+
+            # 3. 모델 로드
+            device = "cuda" if torch.cuda.is_available() else "cpu"
+            print(f"🤖 모델 로딩 중... (model={args.model}, device={device})")
         
-        if device == "cuda":
-            model.float()
+            if args.backend == "cpp" and not _cpp_available:
+                print("❌ pywhispercpp가 필요합니다: pip install pywhispercpp")
+                return
+            if args.backend == "faster" and not _fw_available:
+                print("❌ faster-whisper가 필요합니다: pip install faster-whisper")
+                return
+            model = _get_model(args.backend, args.model, device)
 
-        # 4. 음성 인식 (STT만 수행)
-        print("🎤 음성 인식 중...")
-        with silent_io():
-            result = model.transcribe(audio_data, fp16=False)
+            # 4. 음성 인식 (STT만 수행)
+            print("🎤 음성 인식 중...")
+            if args.backend == "cpp":
+                # openai-whisper 결과와 같은 dict 형태로 맞춤 (t0/t1 단위: 10ms)
+                segs = model.transcribe(audio_data)
+                # 언어는 방금 디코딩에서 감지한 값을 재사용 (auto_detect_language는 인코더를 한 번 더 돌림)
+                lang = _cpp_detected_language(model)
+                segments = [{"start": seg.t0 / 100, "end": seg.t1 / 100, "text": seg.text} for seg in segs]
+                result = {
+                    "language": lang,
+                    "text": " ".join(seg["text"].strip() for seg in segments),
+                    "segments": segments,
+                }
+            elif args.backend == "faster":
+                # openai-whisper 결과와 같은 dict 형태로 맞춤
+                segs, info = model.transcribe(audio_data, beam_size=1, vad_filter=True)
+                segments = [{"start": seg.start, "end": seg.end, "text": seg.text} for seg in segs]
+                result = {
+                    "language": info.language,
+                    "text": " ".join(seg["text"].strip() for seg in segments),
+                    "segments": segments,
+                }
+            else:
+                mel = get_mel_cached(audio_data, model.dims.n_mels) if args.mel_cache else None
+                result = model.transcribe(audio_data, fp16=False, mel=mel, verbose=None)
         
-        # 5. 결과 출력
-        lang = result.get("language", "unknown")
-        text = (result.get("text") or "").strip()
+            # 5. 결과 출력
+            lang = result.get("language", "unknown")
+            text = (result.get("text") or "").strip()
         
-        print("\n" + "="*60)
-        print(f"🌍 감지 언어: {lang}")
-        print("="*60)
-        print(f"📝 전사 결과:\n{text}")
-        print("="*60)
+            print("\n" + "="*60)
+            print(f"🌍 감지 언어: {lang}")
+            print("="*60)
+            print(f"📝 전사 결과:\n{text}")
+            print("="*60)
         
-        # 6. 상세 정보 출력 (옵션)
-        if args.verbose and "segments" in result:
-            print(f"\n📊 세그먼트 정보 (총 {len(result['segments'])}개):")
-            print("-"*60)
-            for i, seg in enumerate(result['segments'], 1):
-                start = seg.get('start', 0)
-                end = seg.get('end', 0)
-                seg_text = seg.get('text', '').strip()
-                print(f"{i}. [{start:.2f}s ~ {end:.2f}s] {seg_text}")
-            print("-"*60)
-
-    except Exception as e:
-        print(f"❌ 에러 발생: {e}")
-        import traceback
-        traceback.print_exc()
-
-    finally:
-        # 메모리 정리
-        if model is not None:
-            del model
-            gc.collect()
-            if torch.cuda.is_available():
-                torch.cuda.empty_cache()
+            # 6. 상세 정보 출력 (옵션)
+            if args.verbose and "segments" in result:
+                print(f"\n📊 세그먼트 정보 (총 {len(result['segments'])}개):")
+                print("-"*60)
+                for i, seg in enumerate(result['segments'], 1):
+                    start = seg.get('start', 0)
+                    end = seg.get('end', 0)
+                    seg_text = seg.get('text', '').strip()
+                    print(f"{i}. [{start:.2f}s ~ {end:.2f}s] {seg_text}")
+                print("-"*60)
+
+        except Exception as e:
+            print(f"❌ 에러 발생: {e}")
+            import traceback
+            traceback.print_exc(file=prev_stderr)
+
+        finally:
+            if sys.stderr is not prev_stderr:
+                sys.stderr.close()
+                sys.stderr = prev_stderr
+            root_logger.setLevel(prev_level)
+            # 메모리 정리 (기본은 캐시에 남겨 다음 호출에서 재사용)
+            if args.oneshot and model is not None:
+                del model
+                _get_model.cache_clear()
+                gc.collect()
+                if torch.cuda.is_available():
+                    torch.cuda.empty_cache()
 
 if __name__ == "__main__":
     start_time = time.time()
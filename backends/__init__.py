@@ -0,0 +1 @@
+"""openai-whisper 외의 추론 백엔드 (선택 의존성)"""
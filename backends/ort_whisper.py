@@ -0,0 +1,110 @@
+"""
+ONNX Runtime 기반 Whisper 추론 백엔드
+optimum ORTModelForSpeechSeq2Seq + IO binding, whisper의 model.transcribe() 형태로 감쌈
+CPU에서는 quantize=True 로 MatMul 가중치를 INT8 동적 양자화한 모델 사용 (VNNI int8 GEMM)
+"""
+import os
+import re
+import glob
+import shutil
+
+import numpy as np
+import torch
+import onnxruntime as ort
+
+from optimum.onnxruntime import ORTModelForSpeechSeq2Seq
+from transformers import WhisperProcessor
+
+SAMPLE_RATE = 16000
+CHUNK_SAMPLES = 30 * SAMPLE_RATE  # Whisper 인코더 입력 1구간 (30초)
+
+# 변환된 ONNX 모델 저장 위치
+ONNX_CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "weights", "onnx")
+
+_LANG_TOKEN = re.compile(r"<\|([a-z]{2,3})\|>")
+
+
+def quantize_int8(export_dir, int8_dir):
+    """ONNX 모델 폴더 → MatMul 가중치만 INT8 동적 양자화한 폴더 (인코더 Conv는 FP32 유지)"""
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    os.makedirs(int8_dir, exist_ok=True)
+    for path in glob.glob(os.path.join(export_dir, "*")):
+        target = os.path.join(int8_dir, os.path.basename(path))
+        if path.endswith(".onnx"):
+            quantize_dynamic(path, target, weight_type=QuantType.QInt8, op_types_to_quantize=["MatMul"])
+        elif os.path.isfile(path) and not path.endswith(".onnx_data"):
+            # config / generation_config / 토크나이저 파일은 그대로 복사
+            shutil.copy(path, target)
+
+
+class ORTWhisper:
+    """ONNX Runtime Whisper, whisper.Whisper.transcribe 와 같은 dict 결과 반환"""
+
+    def __init__(self, name="base", device="cpu", quantize=False, num_threads=0):
+        """quantize: CPU에서 INT8 모델 사용 (GPU에서는 무시)
+        num_threads: ORT intra-op 스레드 수 (0이면 ORT 기본값 = 물리 코어 수)
+        """
+        self.device = device
+        # GPU가 아니면 CPU EP만 사용 (TensorRT EP는 Whisper에서 오히려 느려짐)
+        self.provider = "CUDAExecutionProvider" if device == "cuda" else "CPUExecutionProvider"
+        self.quantize = quantize and device == "cpu"
+        hf_name = name if "/" in name else f"openai/whisper-{name}"
+        export_dir = os.path.join(ONNX_CACHE_DIR, hf_name.split("/")[-1])
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        options.intra_op_num_threads = num_threads
+
+        self.processor = WhisperProcessor.from_pretrained(hf_name)
+        if not os.path.isdir(export_dir):
+            # 최초 1회 ONNX로 변환 후 저장
+            ORTModelForSpeechSeq2Seq.from_pretrained(hf_name, export=True).save_pretrained(export_dir)
+            self.processor.save_pretrained(export_dir)
+
+        model_dir = export_dir
+        if self.quantize:
+            model_dir = export_dir + "-int8"
+            if not os.path.isdir(model_dir):
+                # 중간에 끊겨도 불완전한 폴더가 남지 않도록 .part에 만든 뒤 이름 변경
+                part_dir = model_dir + ".part"
+                shutil.rmtree(part_dir, ignore_errors=True)
+                quantize_int8(export_dir, part_dir)
+                os.replace(part_dir, model_dir)
+
+        self.model = ORTModelForSpeechSeq2Seq.from_pretrained(
+            model_dir, provider=self.provider, session_options=options,
+            use_io_binding=device == "cuda")
+
+        # IO binding이 매번 같은 GPU 주소를 바인딩하도록 mel 입력 버퍼를 미리 할당해 재사용
+        self._mel = None
+        if device == "cuda":
+            self._mel = torch.empty((1, 80, 3000), dtype=torch.float32, device="cuda")
+
+    def _features(self, audio):
+        """30초 단위로 나눈 오디오 → (N, 80, 3000) log-mel"""
+        chunks = [audio[i:i + CHUNK_SAMPLES] for i in range(0, max(len(audio), 1), CHUNK_SAMPLES)]
+        features = self.processor(chunks, sampling_rate=SAMPLE_RATE, return_tensors="pt").input_features
+        if self._mel is None:
+            return features
+        if self._mel.shape != features.shape:
+            self._mel = torch.empty(features.shape, dtype=features.dtype, device="cuda")
+        self._mel.copy_(features, non_blocking=True)
+        return self._mel
+
+    def transcribe(self, audio, task="transcribe", language=None, **_):
+        if isinstance(audio, str):
+            from whisper.audio import load_audio
+            audio = load_audio(audio)
+        audio = np.asarray(audio, dtype=np.float32)
+
+        features = self._features(audio)
+        tokens = self.model.generate(features, task=task, language=language)
+
+        # 언어 토큰은 특수 토큰째로 디코드해서 추출
+        head = self.processor.batch_decode(tokens[:1, :4], skip_special_tokens=False)[0]
+        match = _LANG_TOKEN.search(head)
+        lang = language or (match.group(1) if match else "unknown")
+
+        texts = self.processor.batch_decode(tokens, skip_special_tokens=True)
+        return {"text": " ".join(t.strip() for t in texts).strip(), "language": lang}
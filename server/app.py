@@ -8,6 +8,7 @@ import os
 import json
 import sys
 import io
+import threading
 
 # noconsole 모드 대응: stdout/stderr를 안전하게 처리
 def setup_console():
@@ -34,12 +35,17 @@ setup_console()
 
 # 설정 파일 경로
 CONFIG_FILE = 'stt_config.json'
+# 설정 저장 지연 시간 (연속 변경은 마지막 한 번만 기록)
+SAVE_DEBOUNCE_SEC = 0.5
 
 class API:
     """Python ↔ JavaScript 통신용 API"""
     
     def __init__(self):
         self.config = self.load_config()
+        self._dirty = False
+        self._timer = None
+        self._lock = threading.Lock()
     
     def load_config(self):
         """저장된 설정 불러오기"""
@@ -61,14 +67,38 @@ class API:
             print(f"설정 저장 실패: {e}")
             return False
     
+    def _flush(self):
+        """변경된 설정이 있으면 디스크에 기록"""
+        with self._lock:
+            if not self._dirty:
+                return True
+            self._dirty = False
+            self._timer = None
+            config = dict(self.config)
+        return self.save_config(config)
+
+    def flush(self):
+        """대기 중인 저장을 취소하고 즉시 기록 (앱 종료 시)"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+        return self._flush()
+
     def get_server_url(self):
         """저장된 서버 주소 가져오기"""
         return self.config.get('server_url', '')
     
     def set_server_url(self, url):
-        """서버 주소 저장"""
-        self.config['server_url'] = url
-        return self.save_config(self.config)
+        """서버 주소 저장 (메모리에 즉시 반영, 파일 기록은 디바운스)"""
+        with self._lock:
+            self.config['server_url'] = url
+            self._dirty = True
+            if self._timer is not None:
+                self._timer.cancel()
+            self._timer = threading.Timer(SAVE_DEBOUNCE_SEC, self._flush)
+            self._timer.daemon = True
+            self._timer.start()
+        return True
 
 # HTML 내용 (인라인으로 포함)
 HTML_CONTENT = '''<!doctype html>
@@ -435,8 +465,11 @@ def main():
             min_size=(800, 600)
         )
         
-        # 앱 실행
+        # 앱 실행 (창이 닫힐 때까지 대기)
         webview.start(debug=False)
+
+        # 아직 기록되지 않은 설정 저장
+        api.flush()
         
     except Exception as e:
         # 에러를 파일로 기록 (이모지 없이)
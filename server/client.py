@@ -1,13 +1,18 @@
 #!/usr/bin/env python3
 import requests
 import pyaudio
-import wave
 import argparse
+import io
 import os
+import numpy as np
+import soundfile as sf
 
-def record_audio(filename, duration=5):
-    """마이크로 음성을 녹음하여 WAV 파일로 저장"""
-    CHUNK = 1024
+# 헬스 체크와 STT 요청이 같은 TCP/TLS 연결을 재사용 (keep-alive)
+SESSION = requests.Session()
+
+def record_audio(duration=5):
+    """마이크로 음성을 녹음하여 메모리 상의 WAV 버퍼(BytesIO)로 반환"""
+    CHUNK = 4096
     FORMAT = pyaudio.paInt16
     CHANNELS = 1
     RATE = 16000
@@ -19,45 +24,50 @@ def record_audio(filename, duration=5):
                         frames_per_buffer=CHUNK)
 
         print(f"🎤 녹음 시작... ({duration}초)")
-        frames = []
-
-        for i in range(0, int(RATE / CHUNK * duration)):
-            data = stream.read(CHUNK)
-            frames.append(data)
+        # 전체 길이만큼 미리 할당한 버퍼에 청크를 바로 채움 (리스트 + join 복사 제거)
+        buf = np.empty(RATE * duration, dtype=np.int16)
+        n = 0
+        shown = 0
+        while n < buf.size:
+            k = min(CHUNK, buf.size - n)
+            data = stream.read(k, exception_on_overflow=False)
+            buf[n:n + k] = np.frombuffer(data, dtype=np.int16)
             # 진행률 표시
-            if i % (RATE // CHUNK) == 0:
-                print(f"   {i // (RATE // CHUNK) + 1}초...")
+            if n // RATE >= shown:
+                shown = n // RATE + 1
+                print(f"   {shown}초...")
+            n += k
 
         print("✅ 녹음 완료")
         stream.stop_stream()
         stream.close()
         p.terminate()
 
-        # WAV 파일로 저장
-        wf = wave.open(filename, 'wb')
-        wf.setnchannels(CHANNELS)
-        wf.setsampwidth(p.get_sample_size(FORMAT))
-        wf.setframerate(RATE)
-        wf.writeframes(b''.join(frames))
-        wf.close()
+        # 디스크를 거치지 않고 메모리에 WAV 작성
+        wav_buf = io.BytesIO()
+        sf.write(wav_buf, buf, RATE, format='WAV', subtype='PCM_16')
 
-        return True
+        wav_buf.seek(0)
+        return wav_buf
 
     except Exception as e:
         print(f"❌ 녹음 실패: {e}")
-        return False
+        return None
 
 def check_server_health(server_url):
     """서버 상태 확인"""
     try:
         health_url = server_url.replace('/stt', '/health')
-        response = requests.get(health_url, timeout=5)
+        response = SESSION.get(health_url, timeout=5)
         if response.status_code == 200:
             data = response.json()
             print(f"✅ 서버 연결 성공")
             print(f"   모델: {data.get('model', 'unknown')}")
             print(f"   디바이스: {data.get('device', 'unknown')}")
             return True
+        elif response.status_code == 503:
+            print("⏳ 서버가 모델을 로딩 중입니다. 잠시 후 다시 시도하세요.")
+            return False
         else:
             print(f"⚠️ 서버 응답 이상: {response.status_code}")
             return False
@@ -66,14 +76,18 @@ def check_server_health(server_url):
         print(f"   서버 주소를 확인하세요: {server_url}")
         return False
 
-def send_to_server(audio_file, server_url='http://localhost:5000/stt'):
-    """서버로 오디오 파일 전송 및 결과 수신"""
+def send_to_server(audio_obj, server_url='http://localhost:5000/stt'):
+    """서버로 오디오(파일 경로 또는 메모리 버퍼) 전송 및 결과 수신"""
     try:
         print(f"📤 서버로 전송 중: {server_url}")
 
-        with open(audio_file, 'rb') as f:
-            files = {'audio': (os.path.basename(audio_file), f, 'audio/wav')}
-            response = requests.post(server_url, files=files, timeout=60)
+        if isinstance(audio_obj, (str, os.PathLike)):
+            with open(audio_obj, 'rb') as f:
+                files = {'audio': (os.path.basename(audio_obj), f, 'audio/wav')}
+                response = SESSION.post(server_url, files=files, timeout=60)
+        else:
+            files = {'audio': ('rec.wav', audio_obj, 'audio/wav')}
+            response = SESSION.post(server_url, files=files, timeout=60)
 
         if response.status_code == 200:
             result = response.json()
@@ -131,21 +145,16 @@ def main():
         if not os.path.exists(args.audio):
             print(f"❌ 파일을 찾을 수 없습니다: {args.audio}")
             return
-        audio_file = args.audio
-        print(f"📁 파일 사용: {audio_file}")
+        audio_obj = args.audio
+        print(f"📁 파일 사용: {audio_obj}")
     else:
-        # 새로 녹음
-        audio_file = 'temp_recording.wav'
-        if not record_audio(audio_file, duration=args.duration):
+        # 새로 녹음 (메모리 버퍼)
+        audio_obj = record_audio(duration=args.duration)
+        if audio_obj is None:
             return
 
     # 서버로 전송
-    result = send_to_server(audio_file, server_url=args.server)
-
-    # 임시 파일 삭제
-    if not args.audio and os.path.exists(audio_file):
-        os.remove(audio_file)
-        print(f"\n🧹 임시 파일 삭제: {audio_file}")
+    result = send_to_server(audio_obj, server_url=args.server)
 
 if __name__ == '__main__':
     try:
@@ -0,0 +1,11 @@
+# Gunicorn 설정: gunicorn -c gunicorn.conf.py wsgi:app
+# 모델은 프로세스당 1개만 올리고(workers=1), 번역 HTTP 대기는 스레드로 겹침.
+# 스레드 수는 배칭 워커가 MAX_BATCH(8)개를 모을 수 있도록 넉넉히
+# 모델 로드/워밍업은 server.py가 import 시점에 백그라운드 스레드로 시작하므로
+# 워커는 바로 요청을 받고, 준비 전에는 /health가 503 'loading'을 돌려줌
+# (preload_app을 켜면 로드 스레드가 fork 후 워커에 남지 않으므로 쓰지 말 것)
+bind = "0.0.0.0:8000"
+workers = 1
+worker_class = "gthread"
+threads = 16
+timeout = 120
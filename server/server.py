@@ -1,18 +1,54 @@
+import os
+import sys
+# 저장소 루트의 whisper(정적 KV 캐시, 배치 디코딩 최적화 포함)를 설치본보다 우선 사용
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
 from flask import Flask, request, jsonify
-import whisper
 from deep_translator import GoogleTranslator
-import os
-import tempfile
+import io
+import json
+import re
+import time
+import queue
+import subprocess
 import torch
 import traceback
+import importlib.util
+import threading
+import numpy as np
+import soundfile as sf
+import soxr
+from concurrent.futures import Future, ThreadPoolExecutor
+
+try:
+    from faster_whisper import WhisperModel
+    _fw_available = True
+except Exception:
+    _fw_available = False
+
+try:
+    from flask_sock import Sock
+    _sock_available = True
+except Exception:
+    _sock_available = False
+
+try:
+    from hqq.core.quantize import BaseQuantizeConfig, HQQLinear
+    _hqq_available = True
+except Exception:
+    _hqq_available = False
 
 app = Flask(__name__)
 
+# 세그먼트별 번역 등 네트워크 대기 작업용
+EXECUTOR = ThreadPoolExecutor(max_workers=4)
+
 # CORS 설정 + ngrok 헤더 추가
 @app.after_request
 def after_request(response):
     response.headers.add('Access-Control-Allow-Origin', '*')
-    response.headers.add('Access-Control-Allow-Headers', 'Content-Type, ngrok-skip-browser-warning')
+    response.headers.add('Access-Control-Allow-Headers', 'Content-Type, ngrok-skip-browser-warning, X-STT-Lang')
     response.headers.add('Access-Control-Allow-Methods', 'GET,POST,OPTIONS')
     return response
 
@@ -23,25 +59,377 @@ def handle_options():
     return '', 204
 
 # 모델 로드
-print("="*60)
-print("🤖 Whisper 모델 로딩 중...")
+MODEL_NAME = "base"
+# STT_BACKEND=faster (faster-whisper, 기본) | whisper (openai-whisper) | ort (ONNX Runtime, CPU는 INT8)
+BACKEND = os.environ.get("STT_BACKEND", "faster")
+if BACKEND == "faster" and not _fw_available:
+    print("⚠️ faster-whisper가 설치되어 있지 않아 openai-whisper를 사용합니다")
+    BACKEND = "whisper"
+if BACKEND == "ort" and importlib.util.find_spec("optimum") is None:
+    print("⚠️ optimum[onnxruntime]이 설치되어 있지 않아 openai-whisper를 사용합니다")
+    BACKEND = "whisper"
+
+# STT_QUANT=auto (기본: CPU는 INT8, GPU는 hqq 설치 시 INT4) | off
+QUANT = os.environ.get("STT_QUANT", "auto")
+
+def quantize_int4_hqq(model):
+    """GPU 전용: 인코더/디코더 Linear 층을 HQQ INT4(group 64)로 교체, 연산은 FP16"""
+    config = BaseQuantizeConfig(nbits=4, group_size=64)
+    for part in (model.encoder, model.decoder):
+        for parent in list(part.modules()):
+            for name, child in list(parent.named_children()):
+                if isinstance(child, torch.nn.Linear):
+                    setattr(parent, name, HQQLinear(child, quant_config=config,
+                                                    compute_dtype=torch.float16, device=device))
+    return model
+
 device = "cuda" if torch.cuda.is_available() else "cpu"
-model = whisper.load_model("base", device=device)
-print(f"✅ 모델 로드 완료 (device={device})")
+
+# 모델은 백그라운드 스레드(_load_model)에서 로드 → 프로세스 시작 직후부터 /health 응답,
+# 워밍업까지 끝나면 _model_ready 설정 (그 전의 /stt, /stt_stream 요청은 503)
+# whisper 패키지는 whisper 백엔드일 때만 _load_model에서 바인딩 (그 외 백엔드에서는 None 유지)
+whisper = None
+model = None
+PRECISION = None
+_model_ready = threading.Event()
+_load_error = None
+
+def _load_model():
+    """모델 + VAD 로드, 배칭 워커 시작, 워밍업 (실패 시 _load_error 기록)"""
+    global whisper, model, PRECISION, _vad, _load_error
+    try:
+        print("="*60)
+        print("🤖 Whisper 모델 로딩 중...")
+        if BACKEND == "faster":
+            # CPU: INT8 GEMM, GPU: INT8 가중치 + FP16 연산 (STT_QUANT=off 이면 GPU는 FP16)
+            if device == "cpu":
+                PRECISION = "int8"
+            else:
+                PRECISION = "float16" if QUANT == "off" else "int8_float16"
+            # 인식은 _model_lock으로 직렬화하므로 CT2 워커는 1개면 충분
+            model = WhisperModel(MODEL_NAME, device=device, compute_type=PRECISION,
+                                 num_workers=1, cpu_threads=os.cpu_count())
+        elif BACKEND == "ort":
+            # 저장소 루트의 backends 패키지 (optimum/transformers import가 무거워 여기서)
+            from backends.ort_whisper import ORTWhisper
+            quantize = device == "cpu" and QUANT != "off"
+            PRECISION = "int8" if quantize else "float32"
+            model = ORTWhisper(MODEL_NAME, device=device, quantize=quantize)
+            # 연산 스레드는 ORT(intra-op, 물리 코어 수)가 관리 → torch 스레드와 겹치면 INT8 이득이 사라짐
+            torch.set_num_threads(1)
+        else:
+            # whisper 패키지는 이 백엔드를 쓸 때만 import (배칭/양자화 코드는 전역 whisper 사용)
+            import whisper
+            # 저장소 whisper는 로컬 가중치(ROOT_DIR/weights)만 읽으므로 실행 위치와 무관하게 루트 기준으로 로드
+            weights_path = os.path.join(ROOT_DIR, "weights", f"{MODEL_NAME}.pt")
+            if not os.path.isfile(weights_path):
+                raise RuntimeError(f"가중치 파일이 없습니다: {weights_path} (README의 weights 폴더 준비 참고)")
+            model = whisper.load_model(MODEL_NAME, device=device, model_dir=ROOT_DIR)
+            PRECISION = "float16" if device == "cuda" else "float32"
+            if device == "cuda":
+                # 가중치를 FP16으로 저장 → Linear/Conv 호출마다 FP32→FP16 캐스팅하지 않음.
+                # LayerNorm은 입력을 FP32로 올려 계산하므로 가중치도 FP32 유지
+                torch.set_float32_matmul_precision("high")
+                model.half()
+                for module in model.modules():
+                    if isinstance(module, torch.nn.LayerNorm):
+                        module.float()
+            if QUANT != "off":
+                if device == "cpu":
+                    # CPU INT8 동적 양자화는 STT.py와 같은 저장소 whisper 헬퍼 사용
+                    model = whisper.model.quantize_int8(model)
+                    PRECISION = "int8"
+                elif _hqq_available:
+                    model = quantize_int4_hqq(model)
+                    PRECISION = "int4-hqq"
+            # 디코더 KV 캐시를 미리 할당한 버퍼에 기록 → 토큰마다 torch.cat 재할당 없음
+            model.use_static_kv_cache = True
+            if device == "cuda" and hasattr(torch, "compile"):
+                # 인코더 입력은 항상 (B, n_mels, 3000) 고정 → CUDA graph 캡처로 커널 실행 오버헤드 제거
+                model.encoder = torch.compile(model.encoder, mode="reduce-overhead", fullgraph=False)
+                if os.environ.get("STT_COMPILE_DECODER", "0") == "1":
+                    # 캐시 길이가 토큰마다 변하므로 동적 shape로 컴파일 (실험적)
+                    model.decoder = torch.compile(model.decoder, dynamic=True, fullgraph=False)
+        if device == "cuda":
+            # 연산은 GPU에서 하므로 CPU 스레드가 요청 스레드들과 경쟁하지 않도록
+            torch.set_num_threads(1)
+        print(f"✅ 모델 로드 완료 (backend={BACKEND}, device={device}, precision={PRECISION})")
+        _vad = load_vad()
+        if BACKEND == "whisper":
+            threading.Thread(target=_batch_worker, daemon=True).start()
+        warmup()
+        _model_ready.set()
+    except Exception as e:
+        _load_error = str(e)
+        print(f"❌ 모델 로드 실패: {e}")
+        traceback.print_exc()
+
+# 모델은 재진입 불가 → 여러 요청 스레드에서 인식은 한 번에 하나씩
+_model_lock = threading.Lock()
+
+# Silero VAD: 앞뒤 무음을 잘라 인코더 입력 길이를 줄임 (STT_VAD=0 이면 끔)
+_vad = None
+_vad_lock = threading.Lock()
+
+def load_vad():
+    """(vad_model, get_speech_timestamps) 또는 None (_load_model에서 호출)"""
+    if os.environ.get("STT_VAD", "1") == "0":
+        return None
+    try:
+        vad_model, vad_utils = torch.hub.load('snakers4/silero-vad', 'silero_vad', trust_repo=True)
+        return vad_model, vad_utils[0]
+    except Exception as e:
+        print(f"⚠️ VAD 로드 실패, 무음 제거 없이 진행: {e}")
+        return None
+
+def trim_silence(audio, sr=16000):
+    """첫 음성 시작 ~ 마지막 음성 끝만 남김 (음성이 없거나 VAD가 없으면 원본 유지)"""
+    if _vad is None:
+        return audio
+    vad_model, get_speech_timestamps = _vad
+    # VAD 모델은 내부 상태가 있어 요청 스레드 간 공유 시 직렬화
+    with _vad_lock:
+        speech_ts = get_speech_timestamps(torch.from_numpy(audio), vad_model, sampling_rate=sr)
+    if not speech_ts:
+        return audio
+    return audio[speech_ts[0]['start']:speech_ts[-1]['end']]
+
+# GoogleTranslator.translate()는 요청 파라미터(번역할 텍스트 포함)를 인스턴스에 기록하므로
+# 여러 요청 스레드가 한 인스턴스를 공유하면 안 됨 → 스레드별 캐시
+_translators = threading.local()
+
+def _tr(src, tgt):
+    """언어쌍별 번역기 재사용 (요청마다 새로 만들지 않음, 스레드마다 1개)"""
+    cache = _translators.__dict__.setdefault('cache', {})
+    translator = cache.get((src, tgt))
+    if translator is None:
+        translator = cache[(src, tgt)] = GoogleTranslator(source=src, target=tgt)
+    return translator
+
+def translate_text(text, lang):
+    """인식 결과 번역: ko↔en, 기타 언어는 한국어로 (빈 결과는 번역 요청 없이 "")"""
+    if not text:
+        return ""
+    try:
+        if lang == 'ko':
+            translated = _tr('ko', 'en').translate(text)
+        elif lang == 'en':
+            translated = _tr('en', 'ko').translate(text)
+        else:
+            try:
+                # 직접 번역 (HTTP 1회)
+                translated = _tr(lang, 'ko').translate(text)
+            except Exception:
+                # 지원하지 않는 언어쌍이면 영어를 거쳐 한국어로
+                eng_text = _tr(lang, 'en').translate(text)
+                translated = _tr('en', 'ko').translate(eng_text)
+        print(f"🌐 번역 완료: {translated}")
+        return translated
+    except Exception as e:
+        print(f"⚠️ 번역 실패: {e}")
+        return "(번역 실패)"
+
+def decode_audio(raw):
+    """업로드 바이트 → 16kHz mono float32 (디스크를 거치지 않음)"""
+    try:
+        data, sr = sf.read(io.BytesIO(raw), dtype='float32', always_2d=False)
+    except Exception:
+        # webm/mp4 등 libsndfile 미지원 포맷 (브라우저 녹음) → ffmpeg 파이프 디코딩
+        out = subprocess.run(
+            ["ffmpeg", "-nostdin", "-threads", "0", "-i", "pipe:0",
+             "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", "16000", "-"],
+            input=raw, capture_output=True, check=True).stdout
+        return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
+
+    if data.ndim == 2:
+        data = data.mean(axis=1)
+    if sr != 16000:
+        data = soxr.resample(data, sr, 16000)
+    return np.ascontiguousarray(data, dtype=np.float32)
+
+def lang_hint():
+    """요청 헤더 X-STT-Lang (클라이언트가 기억한 세션 언어) → 언어 코드, 없으면 None (자동 감지)"""
+    hint = request.headers.get('X-STT-Lang', '').strip().lower()
+    return hint if re.fullmatch(r'[a-z]{2,3}', hint) else None
+
+def transcribe(audio, mel=None, language=None):
+    """백엔드별 음성 인식 → (텍스트, 언어), mel은 whisper 백엔드 전용 (decode_mel 결과)
+
+    language를 주면 언어 감지 디코더 패스를 건너뜀
+    """
+    if BACKEND == "faster":
+        segments, info = model.transcribe(audio, beam_size=1, vad_filter=True, language=language)
+        return " ".join(s.text.strip() for s in segments).strip(), info.language
+
+    # CUDA에서는 FP16 (텐서 코어), ort 백엔드는 fp16 인자 무시
+    if mel is not None:
+        result = model.transcribe(None, fp16=(device == "cuda"), mel=mel, language=language)
+    else:
+        result = model.transcribe(audio, fp16=(device == "cuda"), language=language)
+    return result['text'].strip(), result['language']
+
+# 마이크로 배칭: BATCH_WINDOW 동안 모인 요청(최대 MAX_BATCH)을 인코더 1회 + 배치 디코딩으로 처리
+# STT_MAX_BATCH / STT_BATCH_WINDOW_MS 로 조정 (MAX_BATCH=1 이면 사실상 배칭 없음)
+MAX_BATCH = int(os.environ.get("STT_MAX_BATCH", "8"))
+BATCH_WINDOW = float(os.environ.get("STT_BATCH_WINDOW_MS", "15")) / 1000
+_batch_queue = queue.Queue()
+
+def _batch_worker():
+    """큐에 쌓인 mel들을 모아 한 번에 인식하고 각 요청의 Future에 결과 전달"""
+    while True:
+        batch = [_batch_queue.get()]
+        deadline = time.monotonic() + BATCH_WINDOW
+        while len(batch) < MAX_BATCH:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(_batch_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        try:
+            mels = torch.stack([mel for mel, _, _ in batch]).to(device)
+            if device == "cuda":
+                mels = mels.half()
+            # 언어 힌트가 같은 요청끼리 디코딩 (힌트가 있는 묶음은 언어 감지 생략)
+            groups = {}
+            for i, (_, _, language) in enumerate(batch):
+                groups.setdefault(language, []).append(i)
+            results = [None] * len(batch)
+            with _model_lock, torch.no_grad():
+                audio_features = model.embed_audio(mels)
+                for language, idx in groups.items():
+                    options = whisper.DecodingOptions(language=language, fp16=(device == "cuda"),
+                                                      without_timestamps=True)
+                    features = audio_features if len(idx) == len(batch) else audio_features[idx]
+                    for i, r in zip(idx, whisper.decode(model, features, options)):
+                        results[i] = r
+            for (_, fut, _), r in zip(batch, results):
+                fut.set_result((r.text.strip(), r.language))
+        except Exception as e:
+            for _, fut, _ in batch:
+                fut.set_exception(e)
+
+def decode_mel(raw):
+    """클라이언트가 계산한 log-mel(.npy, (n_mels, n_frames)) → 뒤에 30초 무음을 붙인 float32 텐서
+
+    whisper는 오디오 뒤에 0을 붙여 mel을 계산하므로 무음 프레임 값은 (클립 최대값 - 2), 하한 -1.5
+    """
+    mel = np.load(io.BytesIO(raw), allow_pickle=False)
+    if mel.ndim != 2 or mel.shape[0] != model.dims.n_mels or mel.shape[1] == 0:
+        raise ValueError(f"mel 형태가 맞지 않습니다: {mel.shape} (n_mels={model.dims.n_mels})")
+    mel = torch.from_numpy(mel.astype(np.float32))
+    silence = max(mel.max().item() - 2.0, -1.5)
+    return torch.nn.functional.pad(mel, (0, whisper.audio.N_FRAMES), value=silence)
+
+def transcribe_batched(audio, mel=None, language=None):
+    """30초 이하 클립은 배칭 워커로, 그 외(긴 오디오/faster 백엔드)는 바로 인식"""
+    if mel is not None:
+        if mel.shape[-1] > 2 * whisper.audio.N_FRAMES:
+            with _model_lock:
+                return transcribe(None, mel=mel, language=language)
+        mel = mel[:, :whisper.audio.N_FRAMES]
+    elif BACKEND != "whisper" or len(audio) > whisper.audio.N_SAMPLES:
+        with _model_lock:
+            return transcribe(audio, language=language)
+    else:
+        mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio), n_mels=model.dims.n_mels)
+    fut = Future()
+    _batch_queue.put((mel, fut, language))
+    return fut.result()
+
+def transcribe_and_translate(audio, mel=None, language=None):
+    """음성 인식 + 번역 → (텍스트, 언어, 번역), mel은 whisper 백엔드 전용
+
+    faster-whisper는 세그먼트를 디코딩하는 대로 내놓으므로, 나온 세그먼트의 번역 HTTP 요청을
+    바로 던져 뒤쪽 세그먼트 디코딩과 겹침
+    """
+    if BACKEND != "faster":
+        text, lang = transcribe_batched(audio, mel, language)
+        return text, lang, translate_text(text, lang)
+
+    texts, futures = [], []
+    with _model_lock:
+        segments, info = model.transcribe(audio, beam_size=1, vad_filter=True, language=language)
+        for seg in segments:
+            seg_text = seg.text.strip()
+            if seg_text:
+                texts.append(seg_text)
+                futures.append(EXECUTOR.submit(translate_text, seg_text, info.language))
+
+    translations = [f.result() for f in futures]
+    if "(번역 실패)" in translations:
+        translated = "(번역 실패)"
+    else:
+        translated = " ".join(translations)
+    return " ".join(texts), info.language, translated
+
+def warmup():
+    """컴파일/커널 선택/cuDNN 알고리즘 탐색 비용을 첫 요청 전에 미리 지불 (1초 무음)"""
+    if device == "cuda":
+        # 입력 shape가 고정(30초 mel)이므로 처음 고른 conv 알고리즘을 계속 재사용
+        torch.backends.cudnn.benchmark = True
+    print("🔥 모델 워밍업 중...")
+    warm = np.zeros(16000, dtype=np.float32)
+    try:
+        trim_silence(warm)
+        for _ in range(2):
+            if BACKEND == "faster":
+                # 무음은 VAD에서 걸러지므로 VAD 없이 인코더/디코더까지 실행
+                list(model.transcribe(warm, beam_size=1, vad_filter=False)[0])
+            else:
+                # 배칭 경로(embed_audio + decode)와 일반 transcribe 경로 모두
+                transcribe_batched(warm)
+                with _model_lock:
+                    transcribe(warm)
+        print("✅ 워밍업 완료")
+    except Exception as e:
+        print(f"⚠️ 워밍업 실패 (첫 요청이 느릴 수 있음): {e}")
 
 @app.route('/health', methods=['GET'])
 def health_check():
-    """서버 상태 확인"""
+    """서버 상태 확인 (모델 로딩 중이면 503 'loading', 로드 실패 시 500 'error')"""
+    if not _model_ready.is_set():
+        if _load_error is not None:
+            return jsonify({'status': 'error', 'error': _load_error}), 500
+        return jsonify({'status': 'loading', 'model': MODEL_NAME, 'backend': BACKEND}), 503
     return jsonify({
         'status': 'ok',
-        'model': 'base',
-        'device': device
+        'model': MODEL_NAME,
+        'backend': BACKEND,
+        'device': device,
+        'precision': PRECISION,
+        'stream': _sock_available,
+        # whisper 백엔드는 클라이언트가 계산한 log-mel 업로드('mel' 필드)도 받음
+        'mel_input': BACKEND == "whisper",
+        'n_mels': model.dims.n_mels if BACKEND == "whisper" else None
     })
 
 @app.route('/stt', methods=['POST'])
 def speech_to_text():
-    temp_path = None
+    if not _model_ready.is_set():
+        # 로드 실패는 재시도해도 소용없으므로 500 (로딩 중일 때만 503 + Retry-After)
+        if _load_error is not None:
+            return jsonify({'success': False, 'error': f'모델 로드 실패: {_load_error}'}), 500
+        return jsonify({'success': False, 'error': '모델 로딩 중입니다. 잠시 후 다시 시도해주세요.'}), 503, {'Retry-After': '5'}
     try:
+        # 0. 클라이언트가 계산한 log-mel: ffmpeg 디코딩/리샘플/STFT 생략
+        if 'mel' in request.files:
+            if BACKEND != "whisper":
+                return jsonify({'success': False, 'error': 'mel 입력은 whisper 백엔드에서만 지원합니다'}), 400
+            mel = decode_mel(request.files['mel'].read())
+            print(f"⏱️  음성 구간: {(mel.shape[-1] - whisper.audio.N_FRAMES) / 100:.2f}초 (mel)")
+            text, lang, translated = transcribe_and_translate(None, mel=mel, language=lang_hint())
+            print(f"🌍 감지 언어: {lang}")
+            print(f"📝 인식 결과: {text}")
+            return jsonify({
+                'success': True,
+                'original': text,
+                'translated': translated,
+                'language': lang
+            })
+        
         # 1. 오디오 파일 받기
         if 'audio' not in request.files:
             return jsonify({'error': 'No audio file provided'}), 400
@@ -52,40 +440,19 @@ def speech_to_text():
         
         print(f"📥 오디오 파일 수신: {audio_file.filename}")
         
-        # 2. 임시 파일로 저장
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.wav') as tmp_file:
-            temp_path = tmp_file.name
-            audio_file.save(temp_path)
-        
-        print(f"💾 임시 파일 저장: {temp_path}")
-        print(f"📊 파일 크기: {os.path.getsize(temp_path)} bytes")
+        # 2. 메모리에서 바로 디코딩
+        raw = audio_file.read()
+        print(f"📊 파일 크기: {len(raw)} bytes")
+        audio = trim_silence(decode_audio(raw))
+        print(f"⏱️  음성 구간: {len(audio) / 16000:.2f}초")
         
-        # 3. Whisper로 STT 처리
+        # 3. Whisper로 STT 처리 + 4. 번역
         print("🎤 음성 인식 처리 중...")
-        result = model.transcribe(temp_path, fp16=False)
-        
-        text = result['text'].strip()
-        lang = result['language']
+        text, lang, translated = transcribe_and_translate(audio, language=lang_hint())
         
         print(f"🌍 감지 언어: {lang}")
         print(f"📝 인식 결과: {text}")
         
-        # 4. 번역
-        translated = ""
-        try:
-            if lang == 'ko':
-                translated = GoogleTranslator(source='ko', target='en').translate(text)
-            elif lang == 'en':
-                translated = GoogleTranslator(source='en', target='ko').translate(text)
-            else:
-                # 기타 언어는 영어로 번역 후 한국어로
-                eng_text = GoogleTranslator(source=lang, target='en').translate(text)
-                translated = GoogleTranslator(source='en', target='ko').translate(eng_text)
-            print(f"🌐 번역 완료: {translated}")
-        except Exception as e:
-            print(f"⚠️ 번역 실패: {e}")
-            translated = "(번역 실패)"
-        
         # 5. 결과 반환
         return jsonify({
             'success': True,
@@ -116,15 +483,71 @@ def speech_to_text():
             'success': False,
             'error': str(e)
         }), 500
-        
-    finally:
-        # 임시 파일 삭제
-        if temp_path and os.path.exists(temp_path):
+
+# 스트리밍 STT: 발화 중에 오디오를 받아 STREAM_PARTIAL_SEC 분량마다 부분 결과 전송
+STREAM_PARTIAL_SEC = 0.5
+
+if _sock_available:
+    sock = Sock(app)
+
+    @sock.route('/stt_stream')
+    def stt_stream(ws):
+        """WebSocket 스트리밍 STT
+
+        클라이언트 → 서버: int16 PCM (16kHz mono) 바이너리 프레임, 발화가 끝나면 텍스트 "end"
+        서버 → 클라이언트: {"type": "partial", "text"} 및 발화마다 {"type": "final", ...} (/stt 응답과 같은 필드)
+        """
+        if not _model_ready.is_set():
+            if _load_error is not None:
+                error = f'모델 로드 실패: {_load_error}'
+            else:
+                error = '모델 로딩 중입니다. 잠시 후 다시 시도해주세요.'
+            ws.send(json.dumps({'type': 'final', 'success': False, 'error': error}, ensure_ascii=False))
+            return
+        # 핸드셰이크 헤더의 언어 힌트는 연결 동안 유지
+        language = lang_hint()
+        chunks = []
+        n_samples = 0
+        last_partial = 0
+        while True:
+            msg = ws.receive()
+            if msg is None:
+                break
+
+            if isinstance(msg, (bytes, bytearray)):
+                chunks.append(np.frombuffer(msg, dtype=np.int16).astype(np.float32) / 32768.0)
+                n_samples += len(chunks[-1])
+                if n_samples - last_partial >= 16000 * STREAM_PARTIAL_SEC:
+                    last_partial = n_samples
+                    with _model_lock:
+                        text, _ = transcribe(np.concatenate(chunks), language=language)
+                    ws.send(json.dumps({'type': 'partial', 'text': text}, ensure_ascii=False))
+                continue
+
+            if msg != 'end':
+                continue
+
+            # 발화 종료: 전체 오디오로 최종 인식 + 번역 후 다음 발화를 위해 초기화
             try:
-                os.remove(temp_path)
-                print(f"🧹 임시 파일 삭제: {temp_path}")
+                audio = trim_silence(np.concatenate(chunks)) if chunks else np.zeros(0, dtype=np.float32)
+                if len(audio):
+                    text, lang, translated = transcribe_and_translate(audio, language=language)
+                else:
+                    text, lang, translated = "", "unknown", ""
+                print(f"🌍 감지 언어: {lang}")
+                print(f"📝 인식 결과: {text}")
+                result = {'type': 'final', 'success': True, 'original': text,
+                          'translated': translated, 'language': lang}
             except Exception as e:
-                print(f"⚠️ 임시 파일 삭제 실패: {e}")
+                print(f"❌ 스트리밍 인식 실패: {e}")
+                traceback.print_exc()
+                result = {'type': 'final', 'success': False, 'error': str(e)}
+            ws.send(json.dumps(result, ensure_ascii=False))
+            chunks = []
+            n_samples = 0
+            last_partial = 0
+
+threading.Thread(target=_load_model, daemon=True).start()
 
 if __name__ == '__main__':
     PORT = 8000
@@ -134,8 +557,11 @@ if __name__ == '__main__':
     print(f"📡 로컬 접속: http://localhost:{PORT}")
     print(f"🔗 Health Check: http://localhost:{PORT}/health")
     print(f"🎤 STT 엔드포인트: http://localhost:{PORT}/stt")
+    if _sock_available:
+        print(f"📶 스트리밍 엔드포인트: ws://localhost:{PORT}/stt_stream")
+    print("\n💡 운영 환경: gunicorn -c gunicorn.conf.py wsgi:app")
     print("\n💡 ngrok으로 외부 공개:")
     print("   다른 터미널에서 실행: ngrok http 8000")
     print("="*60)
-    
-    app.run(host='0.0.0.0', port=PORT, debug=False)
\ No newline at end of file
+
+    app.run(host='0.0.0.0', port=PORT, debug=False, threaded=True)
\ No newline at end of file
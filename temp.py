@@ -9,12 +9,19 @@ import json
 import sys
 import io
 import threading
-import tempfile
 import requests
+from requests.adapters import HTTPAdapter
 import sounddevice as sd
 import soundfile as sf
 import numpy as np
 import time
+import queue
+
+try:
+    from websockets.sync.client import connect as ws_connect
+    _ws_available = True
+except Exception:
+    _ws_available = False
 
 # noconsole 모드 대응
 def setup_console():
@@ -53,6 +60,46 @@ def get_config_path():
 
 CONFIG_FILE = get_config_path()
 
+# 서버 연결 재사용 (keep-alive): 발화마다 TCP/TLS 핸드셰이크를 다시 하지 않음
+SESSION = requests.Session()
+_adapter = HTTPAdapter(pool_connections=4, pool_maxsize=4)
+SESSION.mount('http://', _adapter)
+SESSION.mount('https://', _adapter)
+
+# Silero VAD 입력 단위 (16kHz에서 512 샘플 = 32ms 고정)
+VAD_FRAME = 512
+
+# whisper log-mel 파라미터 (whisper/audio.py 와 동일)
+N_FFT = 400
+HOP_LENGTH = 160
+MEL_FILTERS_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'whisper', 'assets', 'mel_filters.npz')
+_HANN = (0.5 - 0.5 * np.cos(2 * np.pi * np.arange(N_FFT) / N_FFT)).astype(np.float32)
+
+def load_mel_filters(n_mels):
+    """whisper mel 필터 (n_mels, 201), 파일이 없으면 None"""
+    try:
+        with np.load(MEL_FILTERS_PATH, allow_pickle=False) as f:
+            return f[f"mel_{n_mels}"]
+    except Exception as e:
+        print(f"mel 필터 로드 실패, 오디오로 업로드: {e}")
+        return None
+
+def log_mel_spectrogram(audio, filters):
+    """16kHz float32 → whisper와 같은 log-mel (n_mels, len // 160), float16
+
+    서버(whisper)는 오디오 뒤에 0을 붙여 계산하므로 끝 프레임도 0을 붙여 맞추고,
+    붙인 구간의 프레임은 보내지 않음 (서버가 무음 값으로 채움)
+    """
+    x = np.pad(audio, (N_FFT // 2, N_FFT + N_FFT // 2))
+    x[:N_FFT // 2] = audio[N_FFT // 2:0:-1]  # torch.stft(center=True)의 reflect 패딩
+    n_frames = len(audio) // HOP_LENGTH
+    frames = np.lib.stride_tricks.sliding_window_view(x, N_FFT)[::HOP_LENGTH][:n_frames]
+    spec = np.fft.rfft(frames * _HANN, axis=-1)
+    power = spec.real ** 2 + spec.imag ** 2
+    log_spec = np.log10(np.maximum(filters @ power.T, 1e-10))
+    log_spec = np.maximum(log_spec, log_spec.max() - 8.0)
+    return ((log_spec + 4.0) / 4.0).astype(np.float16)
+
 class VoiceActivatedRecorder:
     """음성 감지 자동 녹음 및 침묵 감지 중지"""
     
@@ -61,26 +108,86 @@ class VoiceActivatedRecorder:
         self.is_recording = False
         self.is_listening = False
         self.sample_rate = 16000
-        self.chunk_duration = 0.01  # 10ms
+        self.chunk_duration = 0.03  # 30ms (콜백 횟수를 줄여 GIL 경합 감소)
         self.chunk_size = int(self.sample_rate * self.chunk_duration)
         
-        # 음성 및 침묵 감지 설정
-        self.voice_threshold = 0.02      # 음성 감지 임계값
-        self.silence_threshold = 0.015   # 침묵 판단 임계값
+        # 음성 및 침묵 감지 설정: Silero VAD 음성 확률 (히스테리시스)
+        self.vad = None                  # 백그라운드 로드, 준비 전/미설치 시 음량 기준 사용
+        self.vad_on = 0.5                # 이 확률을 넘으면 음성
+        self.vad_off = 0.3               # 이 확률 미만이면 침묵
+        self.speech_prob = 0.0
+        self._vad_buf = np.zeros(VAD_FRAME, dtype=np.float32)
+        self._vad_fill = 0
+        self.voice_threshold = 0.02      # 음량 기준 음성 감지 임계값 (VAD 없을 때)
+        self.silence_threshold = 0.015   # 음량 기준 침묵 판단 임계값 (VAD 없을 때)
         self.silence_duration = 0.3      # 침묵 지속 시간 (초)
         self.min_record_duration = 0.5   # 최소 녹음 시간 (초)
+        # 콜백에서는 RMS² 로 비교 (sqrt 생략)
+        self.voice_power = self.voice_threshold ** 2
+        self.silence_power = self.silence_threshold ** 2
         
-        # 녹음 상태
-        self.audio_buffer = []
+        # 녹음 상태: 콜백(생산자) → 소비 스레드 단일 생산자/단일 소비자 링 버퍼 (int16, 미리 할당)
+        # 콜백은 기록 + 위치 알림만 하고, 복사/전송/UI 갱신은 소비 스레드가 함.
+        # 최대 발화 2개 분량이라 소비 스레드가 이전 발화를 읽는 동안 다음 발화가 덮어쓰지 않음
+        self.max_record_duration = 30    # 최대 발화 길이 (초), 넘으면 그 시점에서 처리
+        self.max_record_samples = self.sample_rate * self.max_record_duration
+        self.ring = np.empty(2 * self.max_record_samples, dtype=np.int16)
+        self.write_pos = 0               # 누적 기록 샘플 수 (링 인덱스 = write_pos % ring.size)
+        self.utt_start = 0               # 현재 발화 시작 위치 (누적)
+        self._scratch = np.empty(self.chunk_size, dtype=np.float32)
         self.silence_start = None
         self.record_start_time = None
         
+        # 콜백 → 소비 스레드 알림: ('start' | 'data' | 'end' | 'cancel', 누적 위치)
+        self._events = queue.SimpleQueue()
+        self._streaming = False          # 현재 발화를 WebSocket으로 실시간 전송하는지
+        threading.Thread(target=self._consume, daemon=True).start()
+        
+        # 서버가 log-mel 입력을 지원하면 mel 필터 (test_server_connection 에서 설정)
+        self.mel_filters = None
+        # 서버 /health 가 스트리밍(/stt_stream)을 지원한다고 알렸는지 (test_server_connection 에서 설정)
+        self.server_stream = False
+        
+        # 이번 세션에서 감지된 언어: 다음 요청부터 X-STT-Lang 헤더로 보내 서버의 언어 감지 생략
+        self._last_lang = None
+        
+        # torch import가 느려 창 시작을 막지 않도록 별도 스레드에서 로드
+        threading.Thread(target=self._load_vad, daemon=True).start()
+        
         print("VoiceActivatedRecorder 초기화 완료")
-        print(f"음성 임계값: {self.voice_threshold}, 침묵 임계값: {self.silence_threshold}")
     
-    def calculate_volume(self, audio_chunk):
-        """오디오 청크의 평균 음량 계산"""
-        return np.abs(audio_chunk).mean()
+    def _load_vad(self):
+        """Silero VAD (ONNX) 로드, 실패하면 음량 임계값으로 계속 동작"""
+        try:
+            import torch
+            from silero_vad import load_silero_vad
+            # 프레임당 ~1ms 모델이라 스레드 1개면 충분 (오디오 콜백과 CPU 경합 방지)
+            torch.set_num_threads(1)
+            vad = load_silero_vad(onnx=True)
+            # _vad_buf와 메모리를 공유하는 텐서 → 콜백에서 텐서를 새로 만들지 않음
+            self._vad_frame = torch.from_numpy(self._vad_buf)
+            self.vad = vad
+            print(f"Silero VAD 사용 (음성 확률 > {self.vad_on}, 침묵 < {self.vad_off})")
+        except Exception as e:
+            print(f"Silero VAD 사용 불가, 음량 기준으로 감지: {e}")
+            print(f"음성 임계값: {self.voice_threshold}, 침묵 임계값: {self.silence_threshold}")
+    
+    def _update_speech_prob(self, samples):
+        """콜백 청크(30ms)를 VAD 입력 단위(512 샘플)로 모아 음성 확률 갱신"""
+        pos = 0
+        while pos < len(samples):
+            n = min(len(samples) - pos, VAD_FRAME - self._vad_fill)
+            self._vad_buf[self._vad_fill:self._vad_fill + n] = samples[pos:pos + n]
+            self._vad_fill += n
+            pos += n
+            if self._vad_fill == VAD_FRAME:
+                self.speech_prob = self.vad(self._vad_frame, self.sample_rate).item()
+                self._vad_fill = 0
+    
+    def calculate_power(self, audio_chunk):
+        """오디오 청크의 평균 제곱 (RMS²): 내적 한 번, 임시 배열 할당 없음"""
+        x = audio_chunk.ravel()
+        return float(x @ x) / x.size
     
     def audio_callback(self, indata, frames, time_info, status):
         """오디오 스트림 콜백"""
@@ -90,70 +197,226 @@ class VoiceActivatedRecorder:
         if not self.is_listening:
             return
         
-        # 오디오 데이터 복사
-        audio_chunk = indata.copy()
-        
-        # 음량 계산
-        volume = self.calculate_volume(audio_chunk)
+        # 음성/침묵 판단 (indata 를 바로 사용, 복사는 녹음할 때만)
+        if self.vad is not None:
+            self._update_speech_prob(indata[:, 0])
+            level = self.speech_prob
+            is_voice = level > self.vad_on
+            is_silence = level < self.vad_off
+        else:
+            power = self.calculate_power(indata)
+            level = power ** 0.5
+            is_voice = power > self.voice_power
+            is_silence = power < self.silence_power
+        now = time.monotonic()
         
         # 녹음 중이 아닐 때: 음성 감지 대기
         if not self.is_recording:
-            if volume > self.voice_threshold:
-                # 음성 감지! 녹음 시작
-                print(f"음성 감지 (음량: {volume:.4f}), 녹음 시작")
-                self.is_recording = True
-                self.audio_buffer = []
-                self.record_start_time = time.time()
-                self.silence_start = None
-                
-                # UI 업데이트
+            if not is_voice:
+                return
+            
+            # 음성 감지! 녹음 시작 (UI 갱신/스트리밍 연결은 소비 스레드에서)
+            print(f"음성 감지 ({level:.4f}), 녹음 시작")
+            self.is_recording = True
+            self.utt_start = self.write_pos
+            self.record_start_time = now
+            self.silence_start = None
+            # 서버가 지원하면 발화 중에 실시간 전송 (설정 'stream': false 이면 발화 후 업로드)
+            self._streaming = (_ws_available and self.server_stream
+                               and self.api.config.get('stream', True))
+            self._events.put(('start', self.utt_start))
+        
+        # 녹음 중: int16으로 바로 양자화해 링 버퍼에 기록 (끝에 닿으면 앞으로 이어서)
+        scratch = self._scratch[:frames] if frames <= self._scratch.size else np.empty(frames, dtype=np.float32)
+        np.clip(indata[:, 0], -1.0, 1.0, out=scratch)
+        scratch *= 32767
+        i = self.write_pos % self.ring.size
+        n = min(frames, self.ring.size - i)
+        self.ring[i:i + n] = scratch[:n]
+        self.ring[:frames - n] = scratch[n:]
+        self.write_pos += frames
+        if self._streaming:
+            self._events.put(('data', self.write_pos))
+        
+        if self.write_pos - self.utt_start >= self.max_record_samples:
+            # 최대 발화 길이 도달
+            print(f"최대 녹음 시간({self.max_record_duration}초) 도달, 녹음 중지")
+            self.end_recording()
+            return
+        
+        # 침묵 감지
+        if not is_silence:
+            # 소리 감지, 침묵 타이머 리셋
+            self.silence_start = None
+        elif self.silence_start is None:
+            self.silence_start = now
+        elif (now - self.silence_start >= self.silence_duration
+              and now - self.record_start_time >= self.min_record_duration):
+            # 침묵 감지, 녹음 처리
+            print(f"침묵 감지 ({level:.4f}), 녹음 중지")
+            self.end_recording()
+    
+    def end_recording(self, kind='end'):
+        """발화 종료 알림만 보냄 ('cancel'이면 전송 없이 버림), 처리는 소비 스레드"""
+        self.is_recording = False
+        self.silence_start = None
+        self._events.put((kind, self.write_pos))
+    
+    def _read_ring(self, start, end):
+        """링 버퍼의 누적 위치 [start, end) 구간 복사"""
+        size = self.ring.size
+        i, j = start % size, end % size
+        if end <= start:
+            return np.empty(0, dtype=np.int16)
+        if i < j:
+            return self.ring[i:j].copy()
+        return np.concatenate((self.ring[i:], self.ring[:j]))
+    
+    def _consume(self):
+        """소비 스레드: 콜백이 알린 구간을 읽어 UI 갱신, 실시간 전송, 발화 후 업로드"""
+        ws = receiver = None
+        start = sent = 0
+        while True:
+            kind, pos = self._events.get()
+            
+            if kind == 'start':
+                start = sent = pos
                 try:
                     self.api.window.evaluate_js("showRecording()")
                 except:
                     pass
-        
-        # 녹음 중일 때
-        if self.is_recording:
-            # 버퍼에 추가
-            self.audio_buffer.append(audio_chunk)
+                if self._streaming:
+                    ws, receiver = self._open_stream()
+                continue
+            
+            # 아직 보내지 않은 구간 실시간 전송 (링 버퍼의 int16 PCM 그대로)
+            if ws is not None and pos > sent:
+                try:
+                    ws.send(self._read_ring(sent, pos).tobytes())
+                    sent = pos
+                except Exception as e:
+                    print(f"스트리밍 전송 실패, 발화 후 업로드로 전환: {e}")
+                    ws.close()
+                    ws = None
             
-            # 침묵 감지
-            if volume < self.silence_threshold:
-                if self.silence_start is None:
-                    self.silence_start = time.time()
-                elif time.time() - self.silence_start >= self.silence_duration:
-                    # 최소 녹음 시간 체크
-                    if self.record_start_time and time.time() - self.record_start_time >= self.min_record_duration:
-                        # 침묵 감지, 녹음 처리
-                        print(f"침묵 감지 (음량: {volume:.4f}), 녹음 중지")
-                        self.process_recording()
+            if kind == 'data':
+                continue
+            
+            if kind == 'cancel':
+                if ws is not None:
+                    ws.close()
+                ws = receiver = None
+                continue
+            
+            # 발화 종료
+            print(f"녹음 처리 시작: {(pos - start) / self.sample_rate:.2f}초")
+            try:
+                self.api.window.evaluate_js("showProcessing()")
+            except:
+                pass
+            
+            if ws is not None:
+                # 최종 결과는 수신 스레드가 표시, 응답 대기는 다음 발화를 막지 않도록 별도 스레드
+                thread = threading.Thread(target=self._finish_stream, args=(ws, receiver))
             else:
-                # 소리 감지, 침묵 타이머 리셋
-                self.silence_start = None
+                # 스트리밍을 안 했거나 실패했으면 링 버퍼의 발화 전체를 업로드
+                thread = threading.Thread(target=self._send_audio, args=(self._read_ring(start, pos),))
+            thread.daemon = True
+            thread.start()
+            ws = receiver = None
     
-    def process_recording(self):
-        """녹음된 오디오 처리"""
-        if not self.audio_buffer:
-            return
-        
-        print(f"녹음 처리 시작: {len(self.audio_buffer)} 청크")
-        
-        # 버퍼 복사 및 초기화
-        audio_data = np.concatenate(self.audio_buffer)
-        self.audio_buffer = []
-        self.is_recording = False
-        self.silence_start = None
+    def _request_headers(self):
+        """서버 요청 공통 헤더 (세션 언어가 정해졌으면 X-STT-Lang 포함)"""
+        headers = {'ngrok-skip-browser-warning': 'true'}
+        if self._last_lang:
+            headers['X-STT-Lang'] = self._last_lang
+        return headers
+    
+    def reset_language(self):
+        """세션 언어 초기화 → 다음 발화부터 다시 자동 감지"""
+        print(f"세션 언어 초기화 (이전: {self._last_lang})")
+        self._last_lang = None
+    
+    def _show_result(self, result):
+        """서버 결과 표시: 번역이 있으면 번역문만, 없으면 원문"""
+        if result.get('success'):
+            # 인식된 발화의 언어를 세션 언어로 기억
+            if result.get('original', '').strip() and result.get('language') not in (None, 'unknown'):
+                self._last_lang = result['language']
+            if result.get('translated') and result['translated'] != '(번역 실패)':
+                text = result['translated']
+            else:
+                text = result.get('original', '')
+            
+            if text.strip():
+                text_escaped = json.dumps(text, ensure_ascii=False)
+                self.api.window.evaluate_js(f"showResult({text_escaped})")
+        else:
+            error_msg = result.get('error', '서버 처리 실패')
+            print(f"STT 실패: {error_msg}")
+    
+    def _open_stream(self):
+        """스트리밍 WebSocket 연결 + 수신 스레드 시작 → (ws, receiver), 실패 시 (None, None)"""
+        server_url = self.api.config.get('server_url', 'http://127.0.0.1:8000/stt')
+        ws_url = server_url.replace('https://', 'wss://', 1).replace('http://', 'ws://', 1)
+        ws_url = ws_url.replace('/stt', '/stt_stream')
         
-        # UI 업데이트
         try:
-            self.api.window.evaluate_js("showProcessing()")
-        except:
-            pass
-        
-        # 별도 스레드에서 처리
-        thread = threading.Thread(target=self._send_audio, args=(audio_data,))
-        thread.daemon = True
-        thread.start()
+            ws = ws_connect(ws_url, open_timeout=3, additional_headers=self._request_headers())
+        except Exception as e:
+            print(f"스트리밍 연결 실패, 발화 후 업로드로 전환: {e}")
+            return None, None
+        receiver = threading.Thread(target=self._receive_stream, args=(ws,))
+        receiver.daemon = True
+        receiver.start()
+        print(f"스트리밍 연결: {ws_url}")
+        return ws, receiver
+    
+    def _finish_stream(self, ws, receiver):
+        """발화 종료를 알리고 최종 결과 수신을 기다린 뒤 연결 종료"""
+        try:
+            ws.send('end')
+            receiver.join(timeout=30)
+        except Exception as e:
+            print(f"스트리밍 종료 실패: {e}")
+        finally:
+            ws.close()
+    
+    def _receive_stream(self, ws):
+        """스트리밍 응답 수신: partial은 그대로 표시, final을 받으면 종료"""
+        try:
+            for message in ws:
+                result = json.loads(message)
+                if result.get('type') == 'partial':
+                    if result.get('text', '').strip():
+                        text_escaped = json.dumps(result['text'], ensure_ascii=False)
+                        self.api.window.evaluate_js(f"showResult({text_escaped})")
+                elif result.get('type') == 'final':
+                    print(f"STT 결과: {result}")
+                    self._show_result(result)
+                    return
+        except Exception as e:
+            print(f"스트리밍 수신 실패: {e}")
+    
+    def _encode_audio(self, audio_data):
+        """업로드용 오디오를 메모리에서 인코딩: OGG/Opus (WAV 대비 약 1/10), 미지원 시 WAV"""
+        bio = io.BytesIO()
+        try:
+            sf.write(bio, audio_data, self.sample_rate, format='OGG', subtype='OPUS')
+            return bio, 'recording.ogg', 'audio/ogg'
+        except Exception as e:
+            # libsndfile < 1.0.29 는 Opus 미지원
+            print(f"Opus 인코딩 실패, WAV로 전송: {e}")
+            bio = io.BytesIO()
+            sf.write(bio, audio_data, self.sample_rate, format='WAV', subtype='PCM_16')
+            return bio, 'recording.wav', 'audio/wav'
+    
+    def _encode_mel(self, audio_data, filters):
+        """log-mel을 클라이언트에서 계산해 .npy(float16)로 (서버의 디코딩/STFT 생략)"""
+        audio = audio_data.astype(np.float32) / 32768.0
+        bio = io.BytesIO()
+        np.save(bio, log_mel_spectrogram(audio, filters), allow_pickle=False)
+        return bio
     
     def _send_audio(self, audio_data):
         """오디오를 서버로 전송"""
@@ -163,60 +426,38 @@ class VoiceActivatedRecorder:
                 print(f"오디오가 너무 짧습니다: {len(audio_data)} 샘플")
                 return
             
-            # WAV 파일로 저장
-            temp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.wav')
-            temp_path = temp_file.name
-            temp_file.close()
-            
-            # 16-bit PCM WAV로 저장
-            sf.write(temp_path, audio_data, self.sample_rate, subtype='PCM_16')
-            
-            file_size = os.path.getsize(temp_path)
-            print(f"오디오 파일 저장: {temp_path} ({file_size} bytes)")
-            
-            # 최소 파일 크기 체크 (5KB)
-            if file_size < 5000:
-                print(f"파일이 너무 작습니다: {file_size} bytes")
-                os.unlink(temp_path)
-                return
+            # 디스크를 거치지 않고 메모리에서 변환
+            filters = self.mel_filters
+            if filters is not None:
+                bio = self._encode_mel(audio_data, filters)
+                files = {'mel': ('mel.npy', bio, 'application/octet-stream')}
+                print(f"log-mel 계산: {bio.getbuffer().nbytes} bytes")
+            else:
+                bio, filename, mimetype = self._encode_audio(audio_data)
+                files = {'audio': (filename, bio, mimetype)}
+                print(f"오디오 인코딩: {filename} ({bio.getbuffer().nbytes} bytes)")
+            bio.seek(0)
             
             # 서버 전송
             server_url = self.api.config.get('server_url', 'http://127.0.0.1:8000/stt')
             print(f"서버로 전송 중: {server_url}")
             
-            with open(temp_path, 'rb') as f:
-                files = {'audio': ('recording.wav', f, 'audio/wav')}
-                headers = {
-                    'ngrok-skip-browser-warning': 'true',
-                    'Accept': 'application/json'
-                }
-                
-                response = requests.post(
-                    server_url,
-                    files=files,
-                    headers=headers,
-                    timeout=30
-                )
+            headers = self._request_headers()
+            headers['Accept'] = 'application/json'
+            
+            response = SESSION.post(
+                server_url,
+                files=files,
+                headers=headers,
+                timeout=30
+            )
             
             print(f"서버 응답 상태: {response.status_code}")
             
             if response.status_code == 200:
                 result = response.json()
                 print(f"STT 결과: {result}")
-                
-                if result.get('success'):
-                    # 번역이 있으면 번역문만, 없으면 원문
-                    if result.get('translated') and result['translated'] != '(번역 실패)':
-                        text = result['translated']
-                    else:
-                        text = result.get('original', '')
-                    
-                    if text.strip():
-                        text_escaped = json.dumps(text, ensure_ascii=False)
-                        self.api.window.evaluate_js(f"showResult({text_escaped})")
-                else:
-                    error_msg = result.get('error', '서버 처리 실패')
-                    print(f"STT 실패: {error_msg}")
+                self._show_result(result)
             else:
                 # 오류 응답 내용 출력
                 try:
@@ -226,9 +467,6 @@ class VoiceActivatedRecorder:
                     pass
                 print(f"서버 오류: HTTP {response.status_code}")
             
-            # 임시 파일 삭제
-            os.unlink(temp_path)
-            
         except requests.exceptions.ConnectionError as e:
             print(f"서버 연결 실패: {e}")
             print("서버가 실행 중인지 확인하세요.")
@@ -247,8 +485,13 @@ class VoiceActivatedRecorder:
         
         print("음성 대기 시작")
         self.is_listening = True
-        self.audio_buffer = []
+        self.is_recording = False
         self.silence_start = None
+        # VAD는 이전 프레임 상태를 들고 있으므로 새 스트림마다 초기화
+        self.speech_prob = 0.0
+        self._vad_fill = 0
+        if self.vad is not None:
+            self.vad.reset_states()
         
         try:
             # InputStream 시작
@@ -273,10 +516,12 @@ class VoiceActivatedRecorder:
         print("음성 대기 중지")
         self.is_listening = False
         
-        # 현재 녹음 중이면 처리
-        if self.is_recording and self.audio_buffer:
-            if self.record_start_time and time.time() - self.record_start_time >= self.min_record_duration:
-                self.process_recording()
+        # 현재 녹음 중이면 처리 (최소 녹음 시간 미만이면 버림)
+        if self.is_recording:
+            if self.record_start_time and time.monotonic() - self.record_start_time >= self.min_record_duration:
+                self.end_recording()
+            else:
+                self.end_recording('cancel')
         
         try:
             # 스트림 중지
@@ -286,7 +531,6 @@ class VoiceActivatedRecorder:
                 self.stream = None
             
             self.is_recording = False
-            self.audio_buffer = []
             self.silence_start = None
             
             print("오디오 스트림 중지됨")
@@ -349,6 +593,11 @@ class API:
             self.recorder.stop_listening()
             return {'listening': False}
     
+    def reset_language(self):
+        """세션 언어 초기화 (L 키)"""
+        self.recorder.reset_language()
+        return {'success': True}
+    
     def test_server_connection(self):
         """서버 연결 테스트"""
         server_url = self.config.get('server_url', 'http://127.0.0.1:8000/stt')
@@ -356,11 +605,18 @@ class API:
         
         try:
             print(f"서버 연결 테스트: {health_url}")
-            response = requests.get(health_url, timeout=5)
+            response = SESSION.get(health_url, timeout=5)
             
             if response.status_code == 200:
                 data = response.json()
                 print(f"서버 연결 성공: {data}")
+                # whisper 백엔드 서버면 발화 후 업로드를 오디오 대신 log-mel로
+                if data.get('mel_input') and data.get('n_mels'):
+                    self.recorder.mel_filters = load_mel_filters(data['n_mels'])
+                else:
+                    self.recorder.mel_filters = None
+                # 스트리밍 미지원 서버(flask-sock 없음)면 매 발화 연결 시도 없이 바로 업로드
+                self.recorder.server_stream = bool(data.get('stream'))
                 return {
                     'success': True,
                     'model': data.get('model', 'unknown'),
@@ -514,13 +770,22 @@ window.addEventListener('keydown', (e) => {
     e.preventDefault();
     testServer();
   }
+  
+  // L 키: 세션 언어 초기화 (다음 발화부터 언어 자동 감지)
+  if(e.code === 'KeyL' && !e.target.matches('input')){
+    console.log('L 키 인식됨 - 언어 초기화');
+    e.preventDefault();
+    window.pywebview.api.reset_language().then(() => {
+      statusEl.textContent = '언어 자동 감지로 전환';
+    });
+  }
 });
 
 // pywebview 준비 완료
 window.addEventListener('pywebviewready', () => {
   console.log('pywebviewready 이벤트 발생');
   currEl.textContent = 'Space 키를 눌러 음성 대기를 시작하세요';
-  statusEl.textContent = '준비 완료 (T 키로 서버 테스트)';
+  statusEl.textContent = '준비 완료 (T 키로 서버 테스트, L 키로 언어 재감지)';
   
   // 자동으로 서버 연결 테스트
   setTimeout(testServer, 500);
@@ -571,6 +836,7 @@ def main():
         print("webview 시작...")
         webview.start(debug=False)
         print("webview 종료됨")
+        SESSION.close()
         
     except Exception as e:
         print(f"앱 실행 오류: {e}")
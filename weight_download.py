@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Whisper 가중치 다운로드 (weights/ 폴더)
+
+사용법:
+    python weight_download.py                 # WHISPER_MODELS 환경변수 (기본: base,base.en,small)
+    python weight_download.py base large-v3   # 지정한 모델만
+"""
+import os
+import sys
+import hashlib
+import argparse
+import requests
+from concurrent.futures import ThreadPoolExecutor
+
+WEIGHTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "weights")
+
+# URL 경로의 해시 = 파일 SHA256
+_BASE_URL = "https://openaipublic.azureedge.net/main/whisper/models"
+MODEL_URLS = {
+    "tiny.en": f"{_BASE_URL}/d3dd57d32accea0b295c96e26691aa14d8822fac7d9d27d5dc00b4ca2826dd03/tiny.en.pt",
+    "tiny": f"{_BASE_URL}/65147644a518d12f04e32d6f3b26facc3f8dd46e5390956a9424a650c0ce22b9/tiny.pt",
+    "base.en": f"{_BASE_URL}/25a8566e1d0c1e2231d1c762132cd20e0f96a85d16145c3a00adf5d1ac670ead/base.en.pt",
+    "base": f"{_BASE_URL}/ed3a0b6b1c0edf879ad9b11b1af5a0e6ab5db9205f891f668f8b0e6c6326e34e/base.pt",
+    "small.en": f"{_BASE_URL}/f953ad0fd29cacd07d5a9eda5624af0f6bcf2258be67c92b79389873d91e0872/small.en.pt",
+    "small": f"{_BASE_URL}/9ecf779972d90ba49c06d968637d720dd632c55bbf19d441fb42bf17a411e794/small.pt",
+    "medium.en": f"{_BASE_URL}/d7440d1dc186f76616474e0ff0b3b6b879abc9d1a4926b7adfa41db2d497ab4f/medium.en.pt",
+    "medium": f"{_BASE_URL}/345ae4da62f9b3d59415adc60127b97c714f32e89e936602e85993674d08dcb1/medium.pt",
+    "large-v1": f"{_BASE_URL}/e4b87e7e0bf463eb8e6956e646f1e277e901512310def2c24bf0e11bd3c28e9a/large-v1.pt",
+    "large-v2": f"{_BASE_URL}/81f7c96c852ee8fc832187b0132e569d6c3065a3252ed18e56effd0b6a73e524/large-v2.pt",
+    "large-v3": f"{_BASE_URL}/e5b1a55b89c1367dacf97e3e19bfd829a01529dbfdeefa8caeb59b3f1b81dadb/large-v3.pt",
+    "large-v3-turbo": f"{_BASE_URL}/aff26ae408abcba5fbf8813c21e62b0941638c5f6eebfb145be0c9839262a19a/large-v3-turbo.pt",
+}
+
+# 서버/STT 기본 사용 모델만 (large 계열까지 받으면 ~10GB)
+DEFAULT_MODELS = os.environ.get("WHISPER_MODELS", "base,base.en,small")
+
+CHUNK_SIZE = 1 << 20  # 1MB
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(CHUNK_SIZE), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def download(name, weights_dir=WEIGHTS_DIR):
+    """모델 1개 다운로드 → 파일 경로
+
+    이미 받은 파일은 건너뜀 (해시 재계산 없음). 중단된 다운로드(.part)는 Range 요청으로 이어받고
+    완료 후 SHA256을 확인한 뒤에만 최종 이름으로 옮김
+    """
+    url = MODEL_URLS[name]
+    expected_sha256 = url.split("/")[-2]
+    path = os.path.join(weights_dir, f"{name}.pt")
+    if os.path.isfile(path):
+        print(f"✅ {name}: 이미 있음 ({path})")
+        return path
+
+    os.makedirs(weights_dir, exist_ok=True)
+    part_path = path + ".part"
+    offset = os.path.getsize(part_path) if os.path.isfile(part_path) else 0
+    headers = {"Range": f"bytes={offset}-"} if offset else {}
+
+    print(f"⬇️  {name}: 다운로드 시작" + (f" ({offset} bytes 이어받기)" if offset else ""))
+    with requests.get(url, headers=headers, stream=True, timeout=30) as response:
+        if response.status_code == 416:
+            # 이미 끝까지 받은 .part
+            pass
+        else:
+            response.raise_for_status()
+            # 서버가 Range를 무시하면(200) 처음부터 다시 받음
+            mode = "ab" if response.status_code == 206 else "wb"
+            with open(part_path, mode) as f:
+                for block in response.iter_content(chunk_size=CHUNK_SIZE):
+                    f.write(block)
+
+    if _sha256(part_path) != expected_sha256:
+        os.remove(part_path)
+        raise RuntimeError(f"{name}: SHA256 불일치, 다시 실행하세요")
+
+    os.replace(part_path, path)
+    print(f"✅ {name}: 완료 ({os.path.getsize(path) / 1e6:.0f}MB)")
+    return path
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Whisper 가중치 다운로드")
+    parser.add_argument("models", nargs="*", default=DEFAULT_MODELS.split(","),
+                        help=f"모델 이름 (기본: {DEFAULT_MODELS}), 전체: {', '.join(MODEL_URLS)}")
+    parser.add_argument("--workers", type=int, default=4, help="동시 다운로드 수")
+    args = parser.parse_args()
+
+    models = [m.strip() for m in args.models if m.strip()]
+    unknown = [m for m in models if m not in MODEL_URLS]
+    if unknown:
+        print(f"❌ 알 수 없는 모델: {', '.join(unknown)}")
+        sys.exit(1)
+
+    # 여러 연결로 동시에 받아 TCP slow-start/지연을 겹침
+    failed = []
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        futures = {executor.submit(download, m): m for m in models}
+        for future, name in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                print(f"❌ {name}: {e}")
+                failed.append(name)
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -136,6 +136,10 @@ class Inference:
         """Update the key-value cache according to the updated beams"""
         raise NotImplementedError
 
+    def drop_rows(self, keep_indices: Tensor) -> None:
+        """Keep only the given batch rows of the key-value cache"""
+        raise NotImplementedError
+
     def cleanup_caching(self) -> None:
         """Clean up any resources or hooks after decoding is finished"""
         pass
@@ -175,6 +179,26 @@ class PyTorchInference(Inference):
                 # update the key/value cache to contain the selected sequences
                 self.kv_cache[module] = self.kv_cache[module][source_indices].detach()
 
+    def drop_rows(self, keep_indices: Tensor):
+        # both self-attention and cross-attention caches lose the dropped rows
+        rows = None
+        for module, cache in self.kv_cache.items():
+            buffer = self.model.kv_cache_buffers.get(module)
+            if buffer is None or cache.data_ptr() != buffer.data_ptr():
+                self.kv_cache[module] = cache.index_select(0, keep_indices).detach()
+                continue
+
+            # static cache: compact the kept rows to the front of the preallocated buffer
+            # in place; keep_indices is ascending, so each source row is read before it
+            # could be overwritten
+            if rows is None:
+                rows = keep_indices.tolist()
+            end = cache.shape[1]
+            for i, row in enumerate(rows):
+                if i != row:
+                    buffer[i, :end] = buffer[row, :end]
+            self.kv_cache[module] = buffer[: len(rows), :end]
+
 
 class SequenceRanker:
     def rank(
@@ -682,6 +706,13 @@ class DecodingTask:
         sum_logprobs: Tensor = torch.zeros(n_batch, device=audio_features.device)
         no_speech_probs = [np.nan] * n_batch
 
+        # with greedy decoding of a batch, sequences that reached EOT are removed from
+        # the batch so they stop costing decoder compute; `active` maps rows to the batch
+        drop_finished = self.n_group == 1 and n_batch > 1
+        active = torch.arange(n_batch, device=audio_features.device)
+        active_logprobs = sum_logprobs
+        finished: List[Tuple[Tensor, Tensor]] = []
+
         try:
             for i in range(self.sample_len):
                 logits = self.inference.logits(tokens, audio_features)
@@ -700,13 +731,34 @@ class DecodingTask:
                     logit_filter.apply(logits, tokens)
 
                 # expand the tokens tensor with the selected next tokens
-                tokens, completed = self.decoder.update(tokens, logits, sum_logprobs)
+                tokens, completed = self.decoder.update(tokens, logits, active_logprobs)
 
                 if completed or tokens.shape[-1] > self.n_ctx:
                     break
+
+                if drop_finished:
+                    done = tokens[:, -1] == self.tokenizer.eot
+                    if done.any():
+                        keep = (~done).nonzero().squeeze(-1)
+                        finished.append((active[done], tokens[done]))
+                        sum_logprobs[active] = active_logprobs
+                        active = active.index_select(0, keep)
+                        active_logprobs = active_logprobs.index_select(0, keep)
+                        tokens = tokens.index_select(0, keep)
+                        audio_features = audio_features.index_select(0, keep)
+                        self.inference.drop_rows(keep)
         finally:
             self.inference.cleanup_caching()
 
+        if finished:
+            # reassemble the full batch, padding the dropped sequences with EOT
+            sum_logprobs[active] = active_logprobs
+            full = tokens.new_full((n_batch, tokens.shape[-1]), self.tokenizer.eot)
+            full[active] = tokens
+            for rows, row_tokens in finished:
+                full[rows, : row_tokens.shape[-1]] = row_tokens
+            tokens = full
+
         return tokens, sum_logprobs, no_speech_probs
 
     @torch.no_grad()
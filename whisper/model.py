@@ -78,6 +78,18 @@ def disable_sdpa():
         MultiHeadAttention.use_sdpa = prev_state
 
 
+def quantize_int8(model: nn.Module) -> nn.Module:
+    """Dynamically quantizes the Linear layers to INT8 in place (CPU only; Conv1d stays FP32)"""
+    # quantize_dynamic only maps exact nn.Linear types, so swap the subclass back;
+    # in FP32 its forward only casts the weight dtype, so the outputs are identical
+    for module in model.modules():
+        if type(module) is Linear:
+            module.__class__ = nn.Linear
+    return torch.quantization.quantize_dynamic(
+        model, {nn.Linear}, dtype=torch.qint8, inplace=True
+    )
+
+
 class MultiHeadAttention(nn.Module):
     use_sdpa = True
 
@@ -250,9 +262,14 @@ class TextDecoder(nn.Module):
 
 
 class Whisper(nn.Module):
+    # reuse preallocated self-attention KV buffers across decode calls instead of
+    # growing the cache with torch.cat on every token; see install_kv_cache_hooks()
+    use_static_kv_cache = False
+
     def __init__(self, dims: ModelDimensions):
         super().__init__()
         self.dims = dims
+        self.kv_cache_buffers: Dict[nn.Module, Tensor] = {}
         self.encoder = AudioEncoder(
             self.dims.n_mels,
             self.dims.n_audio_ctx,
@@ -325,6 +342,8 @@ class Whisper(nn.Module):
         hooks = []
 
         def save_to_cache(module, _, output):
+            if self.use_static_kv_cache and output.shape[1] <= self.dims.n_text_ctx:
+                return save_to_static_cache(module, output)
             if module not in cache or output.shape[1] > self.dims.n_text_ctx:
                 # save as-is, for the first token or cross attention
                 cache[module] = output
@@ -332,6 +351,37 @@ class Whisper(nn.Module):
                 cache[module] = torch.cat([cache[module], output], dim=1).detach()
             return cache[module]
 
+        def save_to_static_cache(module, output):
+            start = cache[module].shape[1] if module in cache else 0
+            end = start + output.shape[1]
+            if end > self.dims.n_text_ctx:
+                cache[module] = torch.cat([cache[module], output], dim=1).detach()
+                return cache[module]
+
+            # buffers are only reallocated when the batch grows; smaller batches (including
+            # rows dropped mid-decode, see PyTorchInference.drop_rows) use the leading rows
+            n_batch = output.shape[0]
+            buffer = self.kv_cache_buffers.get(module)
+            if (
+                buffer is None
+                or buffer.shape[0] < n_batch
+                or buffer.shape[1:] != (self.dims.n_text_ctx, output.shape[2])
+                or buffer.dtype != output.dtype
+                or buffer.device != output.device
+                # buffers created under inference_mode cannot be written outside it (and vice versa)
+                or buffer.is_inference() != torch.is_inference_mode_enabled()
+            ):
+                buffer = output.new_empty((n_batch, self.dims.n_text_ctx, output.shape[2]))
+                self.kv_cache_buffers[module] = buffer
+            buffer = buffer[:n_batch]
+
+            if start and cache[module].data_ptr() != buffer.data_ptr():
+                # the cache was replaced outside the hook (e.g. beam rearrangement)
+                buffer[:, :start] = cache[module]
+            buffer[:, start:end] = output.detach()
+            cache[module] = buffer[:, :end]
+            return cache[module]
+
         def install_hooks(layer: nn.Module):
             if isinstance(layer, MultiHeadAttention):
                 hooks.append(layer.key.register_forward_hook(save_to_cache))
@@ -359,6 +409,12 @@ class Whisper(nn.Module):
                 hook.remove()
             hooks.clear()
 
+    def reset_kv_cache(self):
+        """
+        Release the preallocated KV buffers used when `use_static_kv_cache` is enabled.
+        """
+        self.kv_cache_buffers.clear()
+
     def get_memory_usage(self) -> dict:
         """
         Get current memory usage statistics for real-time STT monitoring.
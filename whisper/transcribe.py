@@ -44,6 +44,7 @@ def transcribe(
     append_punctuations: str = "\"'.。,，!！?？:：”)]}、",
     clip_timestamps: Union[str, List[float]] = "0",
     hallucination_silence_threshold: Optional[float] = None,
+    mel: Optional[torch.Tensor] = None,
     **decode_options,
 ):
     """
@@ -111,6 +112,11 @@ def transcribe(
         When word_timestamps is True, skip silent periods longer than this threshold (in seconds)
         when a possible hallucination is detected
 
+    mel: Optional[torch.Tensor]
+        Precomputed log-Mel spectrogram of `audio`, padded with 30 seconds of silence
+        (i.e. `log_mel_spectrogram(audio, model.dims.n_mels, padding=N_SAMPLES)`).
+        When given, the spectrogram is not recomputed.
+
     Returns
     -------
     A dictionary containing the resulting text ("text") and segment-level details ("segments"), and
@@ -128,7 +134,8 @@ def transcribe(
         decode_options["fp16"] = False
 
     # Pad 30-seconds of silence to the input audio, for slicing
-    mel = log_mel_spectrogram(audio, model.dims.n_mels, padding=N_SAMPLES)
+    if mel is None:
+        mel = log_mel_spectrogram(audio, model.dims.n_mels, padding=N_SAMPLES)
     content_frames = mel.shape[-1] - N_FRAMES
     content_duration = float(content_frames * HOP_LENGTH / SAMPLE_RATE)
 